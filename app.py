@@ -2,16 +2,23 @@ import os
 from dotenv import load_dotenv
 from slack_bolt import App
 from slack_bolt.adapter.socket_mode import SocketModeHandler
+from slack_sdk.http_retry.builtin_handlers import RateLimitErrorRetryHandler
 
 from src.handlers.messages import register_message_handlers
 from src.handlers.events import register_event_handlers
 from src.handlers.actions import register_action_handlers
 from src.utils.slack_helpers import send_startup_message
+from src.utils.logging import setup_logging
 
 load_dotenv()
+setup_logging()
 
 app = App(token=os.environ.get("SLACK_BOT_TOKEN"))
 
+# Wait out Slack's Retry-After and retry on rate limits, so final results and
+# errors still land when several PDFs are being posted at once
+app.client.retry_handlers.append(RateLimitErrorRetryHandler(max_retry_count=2))
+
 # Register all handlers
 register_message_handlers(app)
 register_event_handlers(app)
@@ -36,5 +43,7 @@ if __name__ == "__main__":
         if success:
             print(f"Startup message sent to channel: {logging_channel}")
     
-    handler = SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN"))
+    # Socket Mode dispatches events on a thread pool; size it for bursts of events
+    concurrency = int(os.environ.get("SOCKET_MODE_CONCURRENCY", "10"))
+    handler = SocketModeHandler(app, os.environ.get("SLACK_APP_TOKEN"), concurrency=concurrency)
     handler.start()
\ No newline at end of file
@@ -1,15 +1,19 @@
 """Base class for all bots."""
 
+import logging
+
+
 class BaseBot:
     """Base class providing common functionality for all bots."""
     
     def __init__(self, slack_client=None):
         """Initialize bot with Slack client."""
         self.slack_client = slack_client
+        self.logger = logging.getLogger(f"research_bot.{self.__class__.__name__}")
         
     def log(self, message, level="info"):
-        """Log message (placeholder for structured logging)."""
-        print(f"[{level.upper()}] {self.__class__.__name__}: {message}")
+        """Log message through the research_bot logger at the given level."""
+        self.logger.log(getattr(logging, level.upper()), message)
         
     def send_to_channel(self, channel, text):
         """Send message to Slack channel."""
@@ -1,26 +1,127 @@
 """PDF Summarizer Bot - processes PDF files and creates summaries."""
 
+import asyncio
 import os
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
 from src.bots.base_bot import BaseBot
-from src.utils.openai_client import OpenAIClient
+from src.utils.openai_client import OpenAIClient, prompt_cache_key
 from src.utils.airtable_client import AirtableClient
-from src.utils.pdf_helpers import download_pdf_from_slack, extract_text_from_pdf, cleanup_temp_file
-from src.utils.text_utils import chunk_text_at_line_breaks
+from src.utils.pdf_helpers import download_pdf_from_slack, extract_text_from_pdf, has_text_layer, cleanup_temp_file
+from src.utils.pdf_metadata_models import StudyType, Topic
+from src.utils.slack_helpers import SlackMessageStreamer
+from src.utils.text_utils import count_tokens, prepare_for_slack, split_text_by_tokens
 from src.utils import colored_logs as llog
 
+# Ensure environment variables are loaded before reading Airtable config
+load_dotenv()
+
+# Airtable config never changes at runtime, so read it once at import
+AIRTABLE_BASE_ID = os.environ.get("AIRTABLE_AI_TEACHING_AND_LEARNING_BASE")
+AIRTABLE_PDFS_TABLE_ID = os.environ.get("AIRTABLE_PDFS_TABLE_ID", "tblbtIWkj4w8yiIuQ")
+AIRTABLE_PDFS_VIEW_ID = os.environ.get("AIRTABLE_PDFS_VIEW_ID", "viwX7m65gHoOAs7ei")
+
+if not AIRTABLE_BASE_ID:
+    llog.yellow("⚠️ AIRTABLE_AI_TEACHING_AND_LEARNING_BASE is not set; PDF results won't be saved to Airtable")
+
+# Leaves room in gpt-4o's 128k context window for the prompt and response
+MAX_PDF_TEXT_TOKENS = 110_000
+
+# Longer documents are summarized section by section, then combined
+SECTION_TOKENS = 15_000
+MAX_PARALLEL_SECTIONS = 4
+
+# Seconds between one file's progress updates while metadata streams in. Several
+# files extracting at once share Slack's chat.update limit, which the streamer
+# enforces process-wide, so each file may update less often than this
+METADATA_PROGRESS_INTERVAL = 2.0
+
+# Our specific summarization prompt, sent ahead of the extracted PDF text
+SUMMARY_PROMPT = """
+Please analyze this PDF document and provide a structured summary:
+
+**DOCUMENT SUMMARY:**
+- **Main Topic**: [Brief description of the document's primary focus]
+- **Key Points**: [3-5 bullet points of the most important information]
+- **Document Type**: [Research paper, report, manual, etc.]
+- **Target Audience**: [Who this document is intended for]
+- **Key Takeaways**: [2-3 actionable insights or conclusions]
+
+**TECHNICAL DETAILS** (if applicable):
+- **Methodology**: [Research methods, approaches used]
+- **Data/Evidence**: [Key statistics, findings, or evidence presented]
+- **Tools/Technologies**: [Any specific tools, technologies, or frameworks mentioned]
+
+**RELEVANCE ASSESSMENT:**
+- **Academic Value**: [High/Medium/Low - why?]
+- **Practical Applications**: [How can this be applied?]
+- **Related Topics**: [What other areas does this connect to?]
+"""
+
+SECTION_SUMMARY_PROMPT = """
+This is one section of a longer PDF document. Summarize it in detail, keeping its
+main points, methodology, key findings, statistics, and any tools or technologies
+mentioned. Your notes will be combined with notes from the other sections.
+"""
+
+SECTIONS_PREAMBLE = """
+The document was too long to send whole, so below are notes on each of its
+consecutive sections. Base your analysis on them.
+"""
+
+# Static blocks are shared between messages; the Slack SDK doesn't mutate them
+DIVIDER_BLOCK = {"type": "divider"}
+METADATA_HEADING_BLOCK = {
+    "type": "section",
+    "text": {
+        "type": "mrkdwn",
+        "text": "*📋 METADATA EXTRACTED:*"
+    }
+}
+
+
+def mrkdwn_text(text):
+    """Build a mrkdwn text object."""
+    return {"type": "mrkdwn", "text": text}
+
+
+def mrkdwn_section(text):
+    """Build a section block containing a single mrkdwn text object."""
+    return {"type": "section", "text": mrkdwn_text(text)}
+
+
+def encode_blocks(blocks):
+    """
+    Serialize blocks to a JSON string with orjson.
+    
+    Slack accepts `blocks` as a JSON-encoded string, so the SDK's stdlib
+    json.dumps only has to escape one string instead of walking every block.
+    """
+    return orjson.dumps(blocks).decode()
+
 
 class PDFSummarizerBot(BaseBot):
     """Bot that summarizes PDF files using OpenAI and stores results."""
     
+    # Lowercased value -> canonical Airtable option
+    TOPIC_LOOKUP = {topic.lower(): topic.value for topic in Topic}
+    
+    STUDY_TYPE_LOOKUP = {study_type.lower(): study_type.value for study_type in StudyType}
+    
     def __init__(self, slack_client=None):
         """Initialize with OpenAI and Airtable clients."""
         super().__init__(slack_client)
         self.openai_client = OpenAIClient()
         self.airtable_client = AirtableClient()
         self.bot_token = os.environ.get("SLACK_BOT_TOKEN")
+        
+        # Shares the OpenAI client's connection pool and timeout; retries are
+        # disabled because our model fallback loop handles failures
+        self.summary_client = self.openai_client.client.with_options(max_retries=0)
     
     def process_file(self, file_info, channel_id, thread_ts=None):
-        """Process uploaded PDF file through the full workflow."""
+        """Process uploaded PDF file through the full workflow; returns True if the results were posted."""
         file_name = file_info.get('name', 'Unknown')
         file_url = file_info.get('url_private_download')
         
@@ -28,57 +129,169 @@ class PDFSummarizerBot(BaseBot):
         if thread_ts:
             llog.gray(f"📝 Will reply to thread: {thread_ts}")
         
-        temp_file_path = None
+        # Step 1: Download PDF to temp folder
+        temp_file_path = download_pdf_from_slack(file_url, self.bot_token)
+        if not temp_file_path:
+            self.send_error_to_channel(channel_id, "Failed to download PDF file")
+            return False
+        
+        return self.process_downloaded_file(file_info, temp_file_path, channel_id, thread_ts)
+    
+    def process_downloaded_file(self, file_info, temp_file_path, channel_id, thread_ts=None):
+        """
+        Run the workflow after download (metadata, Airtable, Slack); always removes the temp file.
+        
+        Returns:
+            bool: True if the results were posted
+        """
+        file_name = file_info.get('name', 'Unknown')
+        streamer = None
+        
         try:
-            # Step 1: Download PDF to temp folder
-            temp_file_path = download_pdf_from_slack(file_url, self.bot_token)
-            if not temp_file_path:
-                self.send_error_to_channel(channel_id, "Failed to download PDF file")
-                return
-            
-            # Step 2: Extract structured metadata from PDF
-            llog.yellow("🤖 Extracting PDF metadata...")
-            metadata_result = self.openai_client.extract_pdf_metadata(temp_file_path, file_name)
+            # Step 2: Extract structured metadata from PDF (cached by content, so
+            # re-shares and repeated books reactions return instantly). Fields are
+            # shown in a progress message as they stream in; that message then
+            # becomes the results message
+            llog.cyan("🤖 Extracting PDF metadata...")
+            streamer = SlackMessageStreamer(
+                self.slack_client,
+                channel_id,
+                thread_ts=thread_ts,
+                placeholder=f"⏳ Analyzing {file_name}...",
+                flush_interval=METADATA_PROGRESS_INTERVAL
+            )
+            metadata_result = self.openai_client.extract_pdf_metadata(
+                temp_file_path,
+                file_name,
+                on_partial=lambda partial: streamer.update(self.format_metadata_progress(file_name, partial))
+            )
             
-            # Step 3: Log the metadata extraction result (excluding large data)
-            llog.green("📊 Metadata Extraction Result:")
-            # Create a safe version for logging (exclude large binary data)
-            safe_result = {k: v for k, v in metadata_result.items() if k != "metadata" or not isinstance(v, dict) or len(str(v)) < 1000}
-            if metadata_result.get("metadata") and len(str(metadata_result["metadata"])) >= 1000:
-                safe_result["metadata"] = "[Large metadata object - suppressed from logs]"
-            llog.blue(safe_result)
-            llog.divider()
+            # Step 3: Log the metadata extraction result; only formatted when DEBUG is enabled
+            self.logger.debug("📊 Metadata extraction result: %r", metadata_result)
             
             if metadata_result["success"]:
                 metadata = metadata_result["metadata"]
                 
-                # Step 4: Save to Airtable
-                try:
-                    llog.yellow("🗃️ Saving to Airtable...")
-                    airtable_record = self.save_pdf_to_airtable(metadata, temp_file_path)
-                    
-                    llog.green(f"✅ Saved to Airtable: {airtable_record['id']}")
+                # Step 4 & 5: Save to Airtable while posting results to Slack; the
+                # Airtable link is added to the posted message once the record exists
+                llog.cyan("🗃️ Saving to Airtable and posting to Slack...")
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    airtable_future = executor.submit(self.save_pdf_to_airtable, metadata, temp_file_path)
+                    slack_future = executor.submit(
+                        self.update_metadata_message, channel_id, streamer.ts, file_name, metadata, None
+                    )
                     
-                    # Step 5: Send results to Slack
-                    self.send_metadata_to_channel(channel_id, file_name, metadata, airtable_record, thread_ts=thread_ts)
-                    llog.green(f"✅ PDF processing completed successfully: {file_name}")
+                    try:
+                        airtable_record = airtable_future.result()
+                        llog.green(f"✅ Saved to Airtable: {airtable_record['id']}")
+                    except Exception as airtable_error:
+                        # Slack still gets the results even if Airtable fails
+                        llog.red(f"❌ Airtable save failed: {str(airtable_error)}")
+                        airtable_record = None
                     
-                except Exception as airtable_error:
-                    llog.red(f"❌ Airtable save failed: {str(airtable_error)}")
-                    # Still send to Slack even if Airtable fails
-                    self.send_metadata_to_channel(channel_id, file_name, metadata, None, thread_ts=thread_ts)
+                    try:
+                        slack_future.result()
+                    except Exception as slack_error:
+                        if not airtable_record:
+                            raise
+                        # The record exists, so this file must not be reported as failed
+                        # (a retry would save it again); the link update re-sends the results
+                        llog.yellow(f"⚠️ Posting results failed: {str(slack_error)}")
+                
+                if airtable_record:
+                    try:
+                        self.update_metadata_message(channel_id, streamer.ts, file_name, metadata, airtable_record)
+                    except Exception as link_error:
+                        # The results are already posted (and saved); only the link is missing
+                        llog.yellow(f"⚠️ Saved to Airtable but couldn't add the link in Slack: {str(link_error)}")
+                llog.green(f"✅ PDF processing completed successfully: {file_name}")
+                return True
                     
             else:
-                self.send_error_to_channel(channel_id, f"Metadata extraction failed: {metadata_result.get('error', 'Unknown error')}", thread_ts=thread_ts)
+                self.send_error_to_channel(channel_id, f"Metadata extraction failed: {metadata_result.get('error', 'Unknown error')}", thread_ts=thread_ts, ts=streamer.ts)
+                return False
                 
         except Exception as e:
             llog.red(f"❌ PDF processing failed: {str(e)}")
-            self.send_error_to_channel(channel_id, f"Processing failed: {str(e)}", thread_ts=thread_ts)
+            self.send_error_to_channel(channel_id, f"Processing failed: {str(e)}", thread_ts=thread_ts, ts=streamer.ts if streamer else None)
+            return False
         
         finally:
             # Step 6: Always cleanup temp file
-            if temp_file_path:
-                cleanup_temp_file(temp_file_path)
+            cleanup_temp_file(temp_file_path)
+    
+    def process_files_batch(self, files, channel_id, thread_ts=None, max_concurrency=4):
+        """
+        Process several PDF files concurrently on one event loop.
+        
+        Files flow through a two-stage pipeline: a downloader fetches PDFs from
+        Slack ahead of time into a bounded queue, while workers run the
+        metadata/Airtable/Slack steps on files already on disk. Downloading the
+        next PDF overlaps with OpenAI work on the current ones.
+        
+        Args:
+            files: List of Slack file info dicts
+            channel_id: Channel to post results to
+            thread_ts: Thread to reply in (optional)
+            max_concurrency: Maximum number of files processed at once
+            
+        Returns:
+            list: The files whose results were not posted (empty if all succeeded)
+        """
+        if len(files) == 1:
+            # Nothing to overlap; skip the event loop and worker thread
+            return [] if self.process_file(files[0], channel_id, thread_ts=thread_ts) else list(files)
+        
+        succeeded_files = []
+        
+        async def run_all():
+            # Bounded so downloads never get more than one round ahead of the workers
+            downloaded = asyncio.Queue(maxsize=max_concurrency)
+            
+            async def download_all():
+                try:
+                    for file_info in files:
+                        temp_file_path = await asyncio.to_thread(
+                            download_pdf_from_slack, file_info.get('url_private_download'), self.bot_token
+                        )
+                        if temp_file_path:
+                            await downloaded.put((file_info, temp_file_path))
+                        else:
+                            await asyncio.to_thread(
+                                self.send_error_to_channel, channel_id, f"Failed to download PDF file: {file_info.get('name', 'Unknown')}", thread_ts
+                            )
+                finally:
+                    # Workers always get their stop signal, even if downloading broke off
+                    for _ in range(max_concurrency):
+                        await downloaded.put(None)
+            
+            async def process_all():
+                while (item := await downloaded.get()) is not None:
+                    file_info, temp_file_path = item
+                    try:
+                        if await asyncio.to_thread(self.process_downloaded_file, file_info, temp_file_path, channel_id, thread_ts):
+                            succeeded_files.append(file_info)
+                    except Exception as e:
+                        # One file's failure shouldn't stop this worker from taking the next
+                        llog.red(f"❌ PDF processing failed: {str(e)}")
+            
+            try:
+                results = await asyncio.gather(
+                    download_all(), *(process_all() for _ in range(max_concurrency)), return_exceptions=True
+                )
+                for result in results:
+                    if isinstance(result, Exception):
+                        llog.red(f"❌ PDF batch step failed: {str(result)}")
+            finally:
+                # Anything still queued was downloaded but never processed; don't leave it on disk
+                while not downloaded.empty():
+                    item = downloaded.get_nowait()
+                    if item is not None:
+                        cleanup_temp_file(item[1])
+        
+        llog.magenta(f"🔄 Processing {len(files)} PDFs concurrently")
+        asyncio.run(run_all())
+        return [file_info for file_info in files if file_info not in succeeded_files]
     
     def save_pdf_to_airtable(self, metadata: dict, pdf_file_path: str) -> dict:
         """
@@ -91,7 +304,7 @@ class PDFSummarizerBot(BaseBot):
         Returns:
             dict: Created Airtable record
         """
-        base_id = os.environ.get("AIRTABLE_AI_TEACHING_AND_LEARNING_BASE")
+        base_id = AIRTABLE_BASE_ID
         if not base_id:
             raise ValueError("AIRTABLE_AI_TEACHING_AND_LEARNING_BASE environment variable not set")
         
@@ -114,7 +327,7 @@ class PDFSummarizerBot(BaseBot):
         
         # Then upload PDF file as attachment to the created record
         if pdf_file_path and os.path.exists(pdf_file_path):
-            llog.yellow(f"📎 Uploading PDF file: {os.path.basename(pdf_file_path)}")
+            llog.cyan(f"📎 Uploading PDF file: {os.path.basename(pdf_file_path)}")
             try:
                 updated_record = self.airtable_client.upload_attachment_to_record(
                     base_id, "PDFs", record["id"], "File", pdf_file_path
@@ -129,178 +342,184 @@ class PDFSummarizerBot(BaseBot):
     
     def validate_topic(self, topic: str) -> str:
         """Validate and normalize topic value for PDF records."""
-        valid_topics = [
-            "Learning outcomes",
-            "Tool development", 
-            "Professional practice",
-            "Student perspectives",
-            "User experience and interaction",
-            "Theoretical background",
-            "AI literacy",
-            "Other"
-        ]
-        
-        # Try exact match first
-        if topic in valid_topics:
-            return topic
-            
-        # Try case-insensitive match
-        topic_lower = topic.lower()
-        for valid_topic in valid_topics:
-            if topic_lower == valid_topic.lower():
-                return valid_topic
+        # Case-insensitive lookup; exact matches are covered by the lowercased key
+        valid_topic = self.TOPIC_LOOKUP.get(topic.lower())
+        if valid_topic:
+            return valid_topic
                 
         # Default to "Other" if no match
-        llog.yellow(f"⚠️ Unknown topic '{topic}', defaulting to 'Other'")
-        return "Other"
+        llog.yellow(f"⚠️ Unknown topic '{topic}', defaulting to '{Topic.OTHER}'")
+        return Topic.OTHER.value
     
 
     def validate_study_type(self, study_type: str) -> str:
         """Validate and normalize study type value for PDF records."""
-        valid_types = [
-            "Review",
-            "Experimental", 
-            "Quantitative",
-            "Qualitative",
-            "Mixed-methods",
-            "Observational"
-        ]
-        
-        # Try exact match first
-        if study_type in valid_types:
-            return study_type
-            
-        # Try case-insensitive match
-        type_lower = study_type.lower()
-        for valid_type in valid_types:
-            if type_lower == valid_type.lower():
-                return valid_type
+        # Case-insensitive lookup; exact matches are covered by the lowercased key
+        valid_type = self.STUDY_TYPE_LOOKUP.get(study_type.lower())
+        if valid_type:
+            return valid_type
                 
         # Default to "Review" if no match
-        llog.yellow(f"⚠️ Unknown study type '{study_type}', defaulting to 'Review'")
-        return "Review"
+        llog.yellow(f"⚠️ Unknown study type '{study_type}', defaulting to '{StudyType.REVIEW}'")
+        return StudyType.REVIEW.value
     
-    def analyze_pdf_with_openai(self, pdf_file_path):
+    def analyze_pdf_with_openai(self, pdf_file_path, channel_id=None, thread_ts=None):
         """
         Analyze PDF using OpenAI's Responses API with our specific summarization prompt.
         
+        The text layer is extracted locally and sent inline, so no file is
+        uploaded to (or deleted from) OpenAI's Files API. When a channel is
+        given, the analysis is streamed into a Slack message as it generates.
+        
         Args:
             pdf_file_path (str): Path to PDF file
+            channel_id (str): Channel to stream the analysis to (optional)
+            thread_ts (str): Thread to stream the analysis into (optional)
             
         Returns:
             dict: Analysis response from OpenAI
         """
         
+        streamer = None
         try:
-            llog.yellow("🤖 Uploading PDF to OpenAI using Responses API...")
-            
-            # Upload PDF file to OpenAI
-            with open(pdf_file_path, 'rb') as pdf_file:
-                file_upload = self.openai_client.client.files.create(
-                    file=pdf_file,
-                    purpose='user_data'
-                )
+            # Scanned PDFs have no text layer; fail fast instead of sending an empty prompt
+            if not has_text_layer(pdf_file_path):
+                llog.cyan("🖼️ Scanned PDF detected — skipping text path")
+                return {
+                    "success": False,
+                    "error": "This PDF appears to be scanned images with no text layer, so it can't be summarized from text",
+                    "response": None
+                }
             
-            llog.cyan(f"📤 PDF uploaded to OpenAI: {file_upload.id}")
+            pdf_text = extract_text_from_pdf(pdf_file_path)
+            if pdf_text is None:
+                raise ValueError("Could not extract text from PDF")
             
-            # Our specific summarization prompt
-            summary_prompt = """
-Please analyze this PDF document and provide a structured summary:
-
-**DOCUMENT SUMMARY:**
-- **Main Topic**: [Brief description of the document's primary focus]
-- **Key Points**: [3-5 bullet points of the most important information]
-- **Document Type**: [Research paper, report, manual, etc.]
-- **Target Audience**: [Who this document is intended for]
-- **Key Takeaways**: [2-3 actionable insights or conclusions]
-
-**TECHNICAL DETAILS** (if applicable):
-- **Methodology**: [Research methods, approaches used]
-- **Data/Evidence**: [Key statistics, findings, or evidence presented]
-- **Tools/Technologies**: [Any specific tools, technologies, or frameworks mentioned]
-
-**RELEVANCE ASSESSMENT:**
-- **Academic Value**: [High/Medium/Low - why?]
-- **Practical Applications**: [How can this be applied?]
-- **Related Topics**: [What other areas does this connect to?]
-            """
+            if count_tokens(pdf_text) <= MAX_PDF_TEXT_TOKENS:
+                document_text = pdf_text
+            else:
+                # Too long for one request: summarize sections in parallel (map),
+                # then analyze the combined section notes (reduce)
+                sections = split_text_by_tokens(pdf_text, SECTION_TOKENS)
+                llog.cyan(f"✂️ PDF text exceeds {MAX_PDF_TEXT_TOKENS} tokens, summarizing {len(sections)} sections")
+                
+                with ThreadPoolExecutor(max_workers=MAX_PARALLEL_SECTIONS) as executor:
+                    section_responses = list(executor.map(
+                        lambda section: self.create_response_with_fallback(SECTION_SUMMARY_PROMPT, section)[0],
+                        sections
+                    ))
+                
+                section_notes = "\n\n".join(
+                    f"--- Section {i + 1} ---\n{section_response.output_text}"
+                    for i, section_response in enumerate(section_responses)
+                )
+                document_text = SECTIONS_PREAMBLE + "\n\n" + section_notes
             
-            # Try GPT-5 first, fallback to GPT-4o if needed
-            models_to_try = ["gpt-5", "gpt-4o", "gpt-4o-mini"]
-            response = None
-            model_used = None
+            if channel_id and self.slack_client:
+                streamer = SlackMessageStreamer(
+                    self.slack_client, channel_id, thread_ts=thread_ts, placeholder="⏳ Analyzing PDF..."
+                )
             
-            for model in models_to_try:
-                try:
-                    llog.yellow(f"🎯 Trying model: {model}")
-                    
-                    # Create client with timeout for this request
-                    from openai import OpenAI
-                    timeout_client = OpenAI(
-                        api_key=self.openai_client.client.api_key,
-                        timeout=180.0  # 3 minute timeout
-                    )
-                    
-                    response = timeout_client.responses.create(
-                        model=model,
-                        input=[
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "input_file",
-                                        "file_id": file_upload.id,
-                                    },
-                                    {
-                                        "type": "input_text",
-                                        "text": summary_prompt,
-                                    }
-                                ]
-                            }
-                        ]
-                    )
-                    
-                    model_used = model
-                    llog.green(f"✅ Success with {model}")
-                    break
-                    
-                except Exception as e:
-                    error_msg = str(e)
-                    llog.yellow(f"❌ {model} failed: {error_msg}")
-                    
-                    # Skip to GPT-4o-mini if GPT-5 is not available
-                    if "does not exist" in error_msg.lower() or "not found" in error_msg.lower():
-                        llog.yellow(f"⏭️ {model} not available, skipping to next model")
-                    
-                    if model == models_to_try[-1]:  # Last model
-                        raise e
-                    continue
+            response, model_used = self.create_response_with_fallback(SUMMARY_PROMPT, document_text, streamer=streamer)
             
-            # Cleanup uploaded file if we want
-            self.openai_client.client.files.delete(file_upload.id)
-            llog.gray(f"🗑️ Cleaned up uploaded file: {file_upload.id}")
+            if streamer:
+                streamer.finish(f"{response.output_text}\n\n🤖 Analyzed by OpenAI ({model_used})")
             
             return {
                 "success": True,
                 "response": response.output_text,
                 "model": model_used,
-                "file_id": file_upload.id,
                 "response_id": response.id
             }
             
         except Exception as e:
             llog.red(f"OpenAI API Error: {str(e)}")
+            if streamer:
+                streamer.finish(f"❌ PDF analysis failed: {str(e)}")
             return {
                 "success": False,
                 "error": str(e),
                 "response": None
             }
     
-    def send_metadata_to_channel(self, channel_id, file_name, metadata, airtable_record=None, thread_ts=None):
-        """Send formatted metadata and summary to Slack channel as a thread reply using Block Kit."""
+    def create_response_with_fallback(self, instructions, text, streamer=None):
+        """
+        Send instructions and document text to the Responses API, falling back through models.
+        
+        The instructions go first as a developer message so every call with the
+        same instructions shares a byte-identical prefix, and a stable
+        prompt_cache_key routes those calls to OpenAI's prompt cache.
+        
+        Args:
+            instructions (str): Static prompt describing the task
+            text (str): Document text to analyze
+            streamer (SlackMessageStreamer): Receives output text deltas as they
+                stream in (optional; the response is not streamed without one)
+            
+        Returns:
+            tuple: (response, model used)
+        """
+        cache_key = prompt_cache_key("pdf-summarizer", instructions)
+        input_items = [
+            {
+                "role": "developer",
+                "content": instructions
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_text",
+                        "text": text,
+                    }
+                ]
+            }
+        ]
+        
+        # Try GPT-5 first, fallback to GPT-4o if needed
+        models_to_try = ["gpt-5", "gpt-4o", "gpt-4o-mini"]
+        
+        for model in models_to_try:
+            try:
+                llog.cyan(f"🎯 Trying model: {model}")
+                
+                if streamer:
+                    streamer.reset()
+                    with self.summary_client.responses.stream(
+                        model=model,
+                        input=input_items,
+                        prompt_cache_key=cache_key
+                    ) as stream:
+                        for event in stream:
+                            if event.type == "response.output_text.delta":
+                                streamer.append(event.delta)
+                        response = stream.get_final_response()
+                else:
+                    response = self.summary_client.responses.create(
+                        model=model,
+                        input=input_items,
+                        prompt_cache_key=cache_key
+                    )
+                
+                llog.green(f"✅ Success with {model}")
+                return response, model
+                
+            except Exception as e:
+                error_msg = str(e)
+                llog.yellow(f"❌ {model} failed: {error_msg}")
+                
+                # Skip to GPT-4o-mini if GPT-5 is not available
+                if "does not exist" in error_msg.lower() or "not found" in error_msg.lower():
+                    llog.yellow(f"⏭️ {model} not available, skipping to next model")
+                
+                if model == models_to_try[-1]:  # Last model
+                    raise e
+    
+    def build_metadata_blocks(self, file_name, metadata, airtable_record=None):
+        """Build the Block Kit blocks for a metadata and summary message."""
         
         # Build structured blocks for better formatting
-        base_id = os.environ.get("AIRTABLE_AI_TEACHING_AND_LEARNING_BASE")
+        base_id = AIRTABLE_BASE_ID
         
         blocks = [
             {
@@ -310,122 +529,108 @@ Please analyze this PDF document and provide a structured summary:
                     "text": f"📄 PDF Analysis Complete: {file_name}"
                 }
             },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "*📋 METADATA EXTRACTED:*"
-                }
-            },
+            METADATA_HEADING_BLOCK,
             {
                 "type": "section",
                 "fields": [
-                    {
-                        "type": "mrkdwn", 
-                        "text": f"*Title:*\n{metadata['title']}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Year:*\n{metadata.get('year', 'N/A')}"
-                    },
-                    {
-                        "type": "mrkdwn",
-                        "text": f"*Topic:*\n{metadata['topic']}"
-                    },
-                    {
-                        "type": "mrkdwn", 
-                        "text": f"*Study Type:*\n{metadata['study_type']}"
-                    }
+                    mrkdwn_text(f"*Title:*\n{metadata['title']}"),
+                    mrkdwn_text(f"*Year:*\n{metadata.get('year', 'N/A')}"),
+                    mrkdwn_text(f"*Topic:*\n{metadata['topic']}"),
+                    mrkdwn_text(f"*Study Type:*\n{metadata['study_type']}")
                 ]
             }
         ]
         
         # Add link field if available
         if metadata.get('link') and metadata['link'] != 'N/A':
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*🔗 Link:* {metadata['link']}"
-                }
-            })
+            blocks.append(mrkdwn_section(f"*🔗 Link:* {metadata['link']}"))
         
         # Add summary section with chunking for long summaries
         summary_text = f"*📝 SUMMARY:*\n{metadata['summary']}"
-        summary_chunks = chunk_text_at_line_breaks(summary_text, max_length=2800)
         
-        blocks.append({"type": "divider"})
+        blocks.append(DIVIDER_BLOCK)
         
-        for i, chunk in enumerate(summary_chunks):
+        for i, chunk in enumerate(prepare_for_slack(summary_text, max_chunk=2800)):
             # For continuation chunks, don't repeat the "SUMMARY:" header
             if i > 0:
                 chunk = chunk.lstrip()  # Remove leading whitespace
                 if not chunk:
                     continue
                     
-            blocks.append({
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn", 
-                    "text": chunk
-                }
-            })
+            blocks.append(mrkdwn_section(chunk))
         
-        blocks.append({"type": "divider"})
+        blocks.append(DIVIDER_BLOCK)
         
         # Add footer with attribution and Airtable link
         footer_text = "🤖 Analyzed by OpenAI • 🗃️ Saved to Airtable"
         
         # Add inline Airtable link if record exists
         if airtable_record and base_id:
-            # Get table and view IDs from environment
-            table_id = os.environ.get("AIRTABLE_PDFS_TABLE_ID", "tblbtIWkj4w8yiIuQ")
-            view_id = os.environ.get("AIRTABLE_PDFS_VIEW_ID", "viwX7m65gHoOAs7ei")
-            
             # Use proper Airtable URL structure: base/table/view/record?blocks=hide
-            airtable_url = f"https://airtable.com/{base_id}/{table_id}/{view_id}/{airtable_record['id']}?blocks=hide"
+            airtable_url = f"https://airtable.com/{base_id}/{AIRTABLE_PDFS_TABLE_ID}/{AIRTABLE_PDFS_VIEW_ID}/{airtable_record['id']}?blocks=hide"
             footer_text = f"🤖 Analyzed by OpenAI • 🗃️ <{airtable_url}|View in Airtable>"
         
-        footer_block = {
-            "type": "section",
-            "text": {
-                "type": "mrkdwn",
-                "text": footer_text
-            }
-        }
+        blocks.append(mrkdwn_section(footer_text))
         
-        blocks.append(footer_block)
+        return blocks
+    
+    def format_metadata_progress(self, file_name, partial):
+        """Render the metadata fields streamed in so far as a plain progress message."""
+        lines = [f"⏳ *Analyzing {file_name}...*"]
+        if partial.get('title'):
+            lines.append(f"*Title:* {partial['title']}")
+        if partial.get('year'):
+            lines.append(f"*Year:* {partial['year']}")
+        if partial.get('topic'):
+            lines.append(f"*Topic:* {partial['topic']}")
+        if partial.get('study_type'):
+            lines.append(f"*Study Type:* {partial['study_type']}")
+        if partial.get('summary'):
+            lines.append(f"\n*📝 SUMMARY:*\n{partial['summary']}")
         
-        # Send the message with blocks
-        if thread_ts:
-            # Reply in thread
-            self.slack_client.chat_postMessage(
-                channel=channel_id,
-                blocks=blocks,
-                text=f"PDF Analysis Complete: {file_name}",  # Fallback text for notifications
-                thread_ts=thread_ts
-            )
-            llog.green(f"📝 Metadata and summary posted as thread reply with blocks")
+        return "\n".join(lines)
+    
+    def update_metadata_message(self, channel_id, ts, file_name, metadata, airtable_record=None):
+        """Render metadata into an already-posted message, linking the Airtable record once it exists."""
+        blocks = encode_blocks(self.build_metadata_blocks(file_name, metadata, airtable_record))
+        
+        self.slack_client.chat_update(
+            channel=channel_id,
+            ts=ts,
+            blocks=blocks,
+            text=f"PDF Analysis Complete: {file_name}"
+        )
+        if airtable_record:
+            llog.green(f"🔗 Added Airtable link to posted message")
         else:
-            # Fallback to regular message
-            self.slack_client.chat_postMessage(
-                channel=channel_id,
-                blocks=blocks,
-                text=f"PDF Analysis Complete: {file_name}"
-            )
+            llog.green(f"📝 Metadata and summary posted")
     
-    def send_error_to_channel(self, channel_id, error_message, thread_ts=None):
-        """Send error message to Slack channel."""
+    def send_error_to_channel(self, channel_id, error_message, thread_ts=None, ts=None):
+        """
+        Send error message to Slack channel, replacing the message at ts if given.
+        
+        Never raises: this runs from error paths, where a failed post (e.g. a
+        Slack rate limit) must not abort the cleanup and remaining work.
+        """
         error_text = f"❌ **PDF Processing Error**\n\n{error_message}\n\nPlease try again or contact support."
         
-        if thread_ts:
-            # Reply in thread
-            self.slack_client.chat_postMessage(
-                channel=channel_id,
-                text=error_text,
-                thread_ts=thread_ts
-            )
-            llog.red(f"📝 Error posted as thread reply")
-        else:
-            # Fallback to regular message
-            self.send_to_channel(channel_id, error_text)
\ No newline at end of file
+        try:
+            if ts:
+                # Turn the progress message into the error instead of leaving it hanging
+                self.slack_client.chat_update(channel=channel_id, ts=ts, text=error_text)
+                llog.red(f"📝 Error posted in place of progress message")
+                return
+            
+            if thread_ts:
+                # Reply in thread
+                self.slack_client.chat_postMessage(
+                    channel=channel_id,
+                    text=error_text,
+                    thread_ts=thread_ts
+                )
+                llog.red(f"📝 Error posted as thread reply")
+            else:
+                # Fallback to regular message
+                self.send_to_channel(channel_id, error_text)
+        except Exception as e:
+            llog.red(f"❌ Failed to post error message to Slack: {str(e)}")
\ No newline at end of file
@@ -1,34 +1,74 @@
 """Event handlers for file uploads, reactions, etc."""
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
 from src.bots.pdf_summarizer import PDFSummarizerBot
+from src.handlers.messages import TRIGGER_PATTERN
+from src.utils.slack_helpers import get_file_info, is_pdf_file
 from src.utils import colored_logs as llog
 
 
+# Slack can deliver the same upload or reaction more than once (and people
+# add the same reaction twice), so remember what was queued recently
+RECENT_JOB_TTL_SECONDS = 60 * 60
+_recent_jobs = TTLCache(maxsize=10_000, ttl=RECENT_JOB_TTL_SECONDS)
+_recent_jobs_lock = threading.Lock()
+
+
+def claim_job(key):
+    """Record a job key; returns False if the same job was already queued recently."""
+    with _recent_jobs_lock:
+        if key in _recent_jobs:
+            return False
+        _recent_jobs[key] = True
+        return True
+
+
+def release_job(key):
+    """Forget a job key so a failed job can be retried (re-shared or re-reacted) right away."""
+    with _recent_jobs_lock:
+        _recent_jobs.pop(key, None)
+
+
+def find_channel_shares(file_data, channel_id):
+    """Get a file's shares in a channel, public or private (empty if it isn't shared there)."""
+    shares = file_data.get("shares", {})
+    return shares.get("public", {}).get(channel_id) or shares.get("private", {}).get(channel_id) or []
+
+
 def register_event_handlers(app):
     """Register all event handlers."""
     
+    # One bot for every event, so its OpenAI/Airtable connection pools are reused
+    pdf_bot = PDFSummarizerBot(slack_client=app.client)
+    
+    # PDF jobs take minutes (download + OpenAI + Airtable), so they run on their own
+    # pool instead of tying up Bolt's listener threads, which other events need
+    pdf_executor = ThreadPoolExecutor(
+        max_workers=int(os.environ.get("PDF_JOB_WORKERS", "4")),
+        thread_name_prefix="pdf-job"
+    )
+    
     @app.event("app_mention")
     def handle_app_mention(event, say):
         """Handle when bot is @mentioned."""
         llog.magenta("📢 APP MENTION EVENT:")
         llog.blue(event)
         
-        # Extract text after the mention
-        text = event.get('text', '').lower()
+        match = TRIGGER_PATTERN.search(event.get('text', ''))
+        trigger = match.lastgroup if match else None
         
-        if 'hello' in text or 'hi' in text:
+        if trigger == 'greet':
             say(f"Hey there <@{event['user']}>!")
-        elif 'help' in text:
+        elif trigger == 'help':
             say("Hi! Try DMing me 'help' for a full list of commands!")
         else:
             say("Hi! Try DMing me for more features, or say 'help' here!")
     
-    @app.event("file_shared")
-    def handle_file_shared(event, client):
-        """Handle file upload events and route to appropriate bots."""
-        llog.cyan("📁 FILE SHARED EVENT:")
-        llog.blue(event)
-        
+    def process_shared_file(event, client, job_key):
+        """Look up a shared file and summarize it if it's a PDF (runs on the PDF pool)."""
         try:
             # Get detailed file info from Slack API
             file_id = event.get("file_id")
@@ -38,58 +78,127 @@ def register_event_handlers(app):
                 llog.red("❌ No file_id in file_shared event")
                 return
             
-            # Get full file details from Slack
-            file_info = client.files_info(file=file_id)
-            file_data = file_info.get("file", {})
+            # Get full file details from Slack; a cached copy only helps if it
+            # already lists this channel's share (needed for the thread ts)
+            file_data, from_cache = get_file_info(client, file_id)
+            if from_cache and not find_channel_shares(file_data, channel_id):
+                file_data, _ = get_file_info(client, file_id, refresh=True)
             
-            llog.yellow("📋 File details:")
+            llog.cyan("📋 File details:")
             llog.blue(file_data)
             
             # Get the message timestamp from the file shares info
             thread_ts = None
-            shares = file_data.get("shares", {})
-            if shares and "public" in shares and channel_id in shares["public"]:
+            channel_shares = find_channel_shares(file_data, channel_id)
+            if channel_shares:
                 # Get the message timestamp from the first share in this channel
-                share_info = shares["public"][channel_id][0]
-                thread_ts = share_info.get("ts")
+                thread_ts = channel_shares[0].get("ts")
                 llog.cyan(f"📍 Found message timestamp for thread: {thread_ts}")
             
             # Check if it's a PDF
             file_name = file_data.get("name", "")
             mimetype = file_data.get("mimetype", "")
             
-            if mimetype == "application/pdf" or file_name.lower().endswith(".pdf"):
+            if is_pdf_file(file_data):
                 llog.green(f"🔍 PDF detected: {file_name}")
                 
-                # Initialize and run PDF summarizer bot with thread context
-                pdf_bot = PDFSummarizerBot(slack_client=client)
-                pdf_bot.process_file(file_data, channel_id, thread_ts=thread_ts)
+                # Run PDF summarizer bot with thread context; the user was told to
+                # try again if it failed, so let a re-share through
+                if not pdf_bot.process_file(file_data, channel_id, thread_ts=thread_ts):
+                    release_job(job_key)
             else:
                 llog.gray(f"⏭️ Skipping non-PDF file: {file_name} (type: {mimetype})")
                 
         except Exception as e:
             llog.red(f"❌ Error handling file_shared event: {str(e)}")
             llog.blue(f"Event data: {event}")
+            release_job(job_key)
     
-    @app.event("file_public")
-    def handle_file_public(event):
-        """Handle file made public events (ignored for now)."""
-        llog.gray("📄 File made public (ignored)")
+    @app.event("file_shared")
+    def handle_file_shared(event, client):
+        """Handle file upload events by queueing them for the PDF pool."""
+        llog.cyan("📁 FILE SHARED EVENT:")
+        llog.blue(event)
+        
+        # Some file_shared payloads already carry the file's metadata; skip
+        # non-PDFs without spending a files_info round trip on them
+        event_file = event.get("file", {})
+        if event_file.get("mimetype") and not is_pdf_file(event_file):
+            llog.gray(f"⏭️ Skipping non-PDF file: {event_file.get('name', '')} (type: {event_file['mimetype']})")
+            return
+        
+        job_key = ("file", event.get("file_id"), event.get("channel_id"))
+        if not claim_job(job_key):
+            llog.gray(f"⏭️ Ignoring duplicate file_shared event for {event.get('file_id')}")
+            return
+        
+        pdf_executor.submit(process_shared_file, event, client, job_key)
     
-    @app.event("file_created") 
-    def handle_file_created(event):
-        """Handle file created events (ignored for now)."""
-        llog.gray("📄 File created (ignored)")
+    def ignore_event(event):
+        """Acknowledge events we subscribe to but don't act on."""
+        llog.gray(f"⏭️ Ignoring {event.get('subtype') or event.get('type')} event")
     
-    @app.event({"type": "message", "subtype": "file_share"})
-    def handle_file_share_message(event):
-        """Handle file share message events (ignored - handled by file_shared)."""
-        llog.gray("💬 File share message (ignored - handled by file_shared event)")
+    # File uploads are handled by file_shared; these fire for the same upload.
+    # Registering a listener keeps Bolt from warning about unhandled events
+    for ignored_event in (
+        "file_public",
+        "file_created",
+        {"type": "message", "subtype": "file_share"},
+        {"type": "message", "subtype": "channel_join"},
+    ):
+        app.event(ignored_event)(ignore_event)
     
-    @app.event({"type": "message", "subtype": "channel_join"})
-    def handle_channel_join_message(event):
-        """Handle channel join message events (ignored)."""
-        llog.gray("👋 Channel join message (ignored)")
+    def process_books_reaction(channel, timestamp, client):
+        """Summarize any PDFs on a message reacted to with books (runs on the PDF pool)."""
+        claimed_keys = {}
+        
+        # Get the original message to check for PDFs
+        try:
+            message_response = client.conversations_history(
+                channel=channel,
+                latest=timestamp,
+                limit=1,
+                inclusive=True
+            )
+            
+            messages = message_response.get("messages", [])
+            if not messages:
+                llog.yellow("⚠️ Could not retrieve original message")
+                return
+            
+            original_message = messages[0]
+            llog.blue(f"📝 Original message: {original_message}")
+            
+            # Check if message has PDF files; each one is claimed on its own, so a
+            # repeated reaction only picks up files that aren't done or in flight
+            files = original_message.get("files", [])
+            pdf_files = []
+            
+            for file_data in files:
+                if is_pdf_file(file_data):
+                    job_key = ("reaction", channel, timestamp, file_data.get("id"))
+                    if not claim_job(job_key):
+                        llog.gray(f"⏭️ Skipping PDF already processed from this message: {file_data.get('name', '')}")
+                        continue
+                    claimed_keys[file_data.get("id")] = job_key
+                    pdf_files.append(file_data)
+                    llog.green(f"🔍 Found PDF in reacted message: {file_data.get('name', '')}")
+            
+            # Process the PDF files concurrently
+            if pdf_files:
+                llog.magenta(f"🔄 Processing {len(pdf_files)} PDF(s) from books reaction")
+                # Use the original message timestamp as thread_ts to reply in thread
+                failed_files = pdf_bot.process_files_batch(pdf_files, channel, thread_ts=timestamp)
+                # Let the user retry just the failed files by reacting again
+                for file_data in failed_files:
+                    release_job(claimed_keys[file_data.get("id")])
+            else:
+                llog.cyan("📚 Books reaction added but no new PDF files found in message")
+                
+        except Exception as e:
+            llog.red(f"❌ Error retrieving message for reaction: {str(e)}")
+            for job_key in claimed_keys.values():
+                release_job(job_key)
     
     @app.event("reaction_added")
     def handle_reaction_added(event, client):
@@ -107,51 +216,10 @@ def register_event_handlers(app):
                 llog.gray(f"⏭️ Ignoring non-books reaction: {reaction}")
                 return
             
+            # Duplicate reactions are filtered per file once the message is fetched
             llog.green(f"📚 Books emoji detected! Processing message in {channel} at {timestamp}")
-            
-            # Get the original message to check for PDFs
-            try:
-                message_response = client.conversations_history(
-                    channel=channel,
-                    latest=timestamp,
-                    limit=1,
-                    inclusive=True
-                )
-                
-                messages = message_response.get("messages", [])
-                if not messages:
-                    llog.yellow("⚠️ Could not retrieve original message")
-                    return
-                
-                original_message = messages[0]
-                llog.blue(f"📝 Original message: {original_message}")
-                
-                # Check if message has PDF files
-                files = original_message.get("files", [])
-                pdf_files = []
-                
-                for file_data in files:
-                    file_name = file_data.get("name", "")
-                    mimetype = file_data.get("mimetype", "")
-                    
-                    if mimetype == "application/pdf" or file_name.lower().endswith(".pdf"):
-                        pdf_files.append(file_data)
-                        llog.green(f"🔍 Found PDF in reacted message: {file_name}")
-                
-                # Process each PDF file
-                if pdf_files:
-                    pdf_bot = PDFSummarizerBot(slack_client=client)
-                    
-                    for file_data in pdf_files:
-                        llog.magenta(f"🔄 Processing PDF from books reaction: {file_data.get('name', 'Unknown')}")
-                        # Use the original message timestamp as thread_ts to reply in thread
-                        pdf_bot.process_file(file_data, channel, thread_ts=timestamp)
-                else:
-                    llog.yellow("📚 Books reaction added but no PDF files found in message")
-                    
-            except Exception as e:
-                llog.red(f"❌ Error retrieving message for reaction: {str(e)}")
+            pdf_executor.submit(process_books_reaction, channel, timestamp, client)
                 
         except Exception as e:
             llog.red(f"❌ Error handling reaction_added event: {str(e)}")
-            llog.blue(f"Event data: {event}")
\ No newline at end of file
+            llog.blue(f"Event data: {event}")
@@ -1,10 +1,14 @@
 """Message event handlers for Slack bot."""
 
 import os
+import re
 from src.bots.hello_bot import HelloBot
 from src.bots.help_bot import HelpBot
 from src.utils import colored_logs as llog
 
+# Matched as whole words anywhere in the message, so "this" doesn't count as "hi"
+TRIGGER_PATTERN = re.compile(r'\b(?P<greet>hello|hi)\b|\b(?P<help>help)\b', re.IGNORECASE)
+
 
 def register_message_handlers(app):
     """Register all message event handlers."""
@@ -19,7 +23,7 @@ def register_message_handlers(app):
     @app.message()
     def route_messages(message, say):
         """Route messages to appropriate bots based on content."""
-        text = message.get('text', '').lower().strip()
+        text = message.get('text', '').strip()
         user_id = message.get('user')
         channel_type = message.get('channel_type', '')
         
@@ -34,8 +38,11 @@ def register_message_handlers(app):
         llog.blue(message)
         llog.divider()
         
-        # Route to specific bots based on message content
-        if 'hello' in text or 'hi' in text:
+        # Route to specific bots based on the first trigger word in the message
+        match = TRIGGER_PATTERN.search(text)
+        trigger = match.lastgroup if match else None
+        
+        if trigger == 'greet':
             llog.green(f"→ Routing to HelloBot: '{text}'")
             hello_bot.handle_message(message, say)
             # Centralized logging
@@ -44,7 +51,7 @@ def register_message_handlers(app):
                     channel=logging_channel,
                     text=f"HelloBot greeted user <@{user_id}>"
                 )
-        elif 'help' in text:
+        elif trigger == 'help':
             llog.green(f"→ Routing to HelpBot: '{text}'")
             help_bot.handle_message(message, say)
             # Centralized logging
@@ -55,4 +62,4 @@ def register_message_handlers(app):
                 )
         else:
             # Log unrecognized messages but don't respond
-            llog.yellow(f"→ Unrecognized message: '{text}' from user {user_id}")
\ No newline at end of file
+            llog.cyan(f"→ Unrecognized message: '{text}' from user {user_id}")
\ No newline at end of file
@@ -1,10 +1,62 @@
 """Generic Airtable client utility for any base/table operations."""
 
+import asyncio
+import mmap
 import os
-from typing import Dict, Any, Optional
-from pyairtable import Api
+import threading
+import time
+from typing import Dict, Any, List, Optional
+from pyairtable import Api, retry_strategy
 from src.utils import colored_logs as llog
 
+# Airtable allows 5 requests per second per base before returning 429s
+# (followed by a 30 second cooldown)
+AIRTABLE_REQUESTS_PER_SECOND = 5
+
+# Airtable's batch endpoints accept at most 10 records per request
+AIRTABLE_BATCH_SIZE = 10
+
+# (connect, read) seconds, so a stalled connection can't hang a worker
+AIRTABLE_TIMEOUT = (3, 30)
+
+
+class TokenBucket:
+    """Thread-safe token bucket that blocks callers until a token is available."""
+    
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until the bucket has refilled enough."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                
+                wait = (1 - self.tokens) / self.rate
+            
+            time.sleep(wait)
+
+
+# Shared by every AirtableClient in the process so concurrent callers stay under the limit
+_rate_limiter = TokenBucket(AIRTABLE_REQUESTS_PER_SECOND, AIRTABLE_REQUESTS_PER_SECOND)
+
 
 class AirtableClient:
     """Generic client for interacting with any Airtable base and table."""
@@ -23,12 +75,21 @@ class AirtableClient:
         if not self.api_token:
             raise ValueError("AIRTABLE_API_TOKEN environment variable is not set")
             
-        self.api = Api(self.api_token)
+        self.api = Api(
+            self.api_token,
+            timeout=AIRTABLE_TIMEOUT,
+            retry_strategy=retry_strategy(total=3, backoff_factor=0.3)
+        )
+        self.tables = {}
         llog.gray(f"🗃️ Initialized Airtable client")
     
     def get_table(self, base_id: str, table_name: str):
-        """Get a specific table from a base."""
-        return self.api.table(base_id, table_name)
+        """Get a specific table from a base, reusing it across calls."""
+        key = (base_id, table_name)
+        table = self.tables.get(key)
+        if table is None:
+            table = self.tables[key] = self.api.table(base_id, table_name)
+        return table
     
     def create_record(self, base_id: str, table_name: str, fields: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -46,6 +107,7 @@ class AirtableClient:
             table = self.get_table(base_id, table_name)
             
             llog.cyan(f"📝 Creating record in {table_name}")
+            _rate_limiter.acquire()
             record = table.create(fields)
             
             llog.green(f"✅ Created record: {record['id']}")
@@ -76,6 +138,7 @@ class AirtableClient:
             table = self.get_table(base_id, table_name)
             
             llog.cyan(f"🔄 Updating record: {record_id}")
+            _rate_limiter.acquire()
             record = table.update(record_id, fields)
             
             llog.green(f"✅ Updated record: {record_id}")
@@ -85,6 +148,72 @@ class AirtableClient:
             llog.red(f"❌ Failed to update record: {str(e)}")
             raise e
     
+    def batch_create_records(self, base_id: str, table_name: str, records: List[Dict[str, Any]], typecast: bool = False) -> List[Dict[str, Any]]:
+        """
+        Create many records, packing up to 10 into each API request.
+        
+        Args:
+            base_id: Airtable base ID
+            table_name: Name of the table
+            records: List of field dictionaries, one per record
+            typecast: Let Airtable convert values to the field types
+            
+        Returns:
+            list: Created Airtable records
+        """
+        try:
+            table = self.get_table(base_id, table_name)
+            
+            llog.cyan(f"📝 Creating {len(records)} records in {table_name}")
+            created = []
+            for start in range(0, len(records), AIRTABLE_BATCH_SIZE):
+                _rate_limiter.acquire()
+                created.extend(table.batch_create(records[start:start + AIRTABLE_BATCH_SIZE], typecast=typecast))
+            
+            llog.green(f"✅ Created {len(created)} records")
+            return created
+            
+        except Exception as e:
+            llog.red(f"❌ Failed to batch create records: {str(e)[:500]}")
+            raise e
+    
+    def batch_update_records(self, base_id: str, table_name: str, records: List[Dict[str, Any]], typecast: bool = False) -> List[Dict[str, Any]]:
+        """
+        Update many records, packing up to 10 into each API request.
+        
+        Args:
+            base_id: Airtable base ID
+            table_name: Name of the table
+            records: List of {"id": record_id, "fields": {...}} dictionaries
+            typecast: Let Airtable convert values to the field types
+            
+        Returns:
+            list: Updated Airtable records
+        """
+        try:
+            table = self.get_table(base_id, table_name)
+            
+            llog.cyan(f"🔄 Updating {len(records)} records in {table_name}")
+            updated = []
+            for start in range(0, len(records), AIRTABLE_BATCH_SIZE):
+                _rate_limiter.acquire()
+                updated.extend(table.batch_update(records[start:start + AIRTABLE_BATCH_SIZE], typecast=typecast))
+            
+            llog.green(f"✅ Updated {len(updated)} records")
+            return updated
+            
+        except Exception as e:
+            llog.red(f"❌ Failed to batch update records: {str(e)[:500]}")
+            raise e
+    
+    async def acreate_record(self, base_id: str, table_name: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Async create_record; the blocking request runs on a worker thread."""
+        return await asyncio.to_thread(self.create_record, base_id, table_name, fields)
+    
+    async def aupdate_record(self, base_id: str, table_name: str, record_id: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Async update_record; the blocking request runs on a worker thread."""
+        return await asyncio.to_thread(self.update_record, base_id, table_name, record_id, fields)
+    
     def search_records(self, base_id: str, table_name: str, formula: Optional[str] = None) -> list:
         """
         Search for records in any Airtable table.
@@ -100,6 +229,7 @@ class AirtableClient:
         try:
             table = self.get_table(base_id, table_name)
             
+            _rate_limiter.acquire()
             if formula:
                 records = table.all(formula=formula)
             else:
@@ -127,6 +257,7 @@ class AirtableClient:
         try:
             table = self.get_table(base_id, table_name)
             
+            _rate_limiter.acquire()
             table.delete(record_id)
             llog.green(f"✅ Deleted record: {record_id}")
             return True
@@ -139,6 +270,9 @@ class AirtableClient:
         """
         Upload attachment directly to an existing Airtable record using pyairtable's upload method.
         
+        The file is memory-mapped rather than read into a bytes buffer, so its
+        pages are loaded on demand while pyairtable base64-encodes the payload.
+        
         Args:
             base_id: Airtable base ID
             table_name: Name of the table
@@ -153,7 +287,18 @@ class AirtableClient:
             table = self.get_table(base_id, table_name)
             
             llog.cyan(f"📎 Uploading attachment to record {record_id}")
-            record = table.upload_attachment(record_id, field_name, file_path)
+            _rate_limiter.acquire()
+            with open(file_path, 'rb') as attachment_file:
+                fd = attachment_file.fileno()
+                if os.fstat(fd).st_size == 0:
+                    # mmap can't map an empty file
+                    record = table.upload_attachment(record_id, field_name, file_path, content=b"")
+                else:
+                    if hasattr(os, "posix_fadvise"):
+                        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                    
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as content:
+                        record = table.upload_attachment(record_id, field_name, file_path, content=content)
             
             llog.green(f"✅ Attachment uploaded successfully")
             return record
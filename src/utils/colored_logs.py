@@ -1,7 +1,12 @@
 """Colored console logging utility similar to chalk/ansi colors."""
 
-import json
-from typing import Any, List
+import logging
+import orjson
+from typing import Any, Callable, Dict, Tuple
+
+logger = logging.getLogger("research_bot")
+
+DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
 
 class AnsiColors:
@@ -20,67 +25,74 @@ class AnsiColors:
     DARKGRAY = '\u001b[38;5;239m'
 
 
-def _log_with_color(things: List[Any], color: str) -> None:
-    """Log items with specified color."""
-    color_code = getattr(AnsiColors, color.upper())
-    
-    for thing in things:
-        if isinstance(thing, str):
-            print(f"{color_code}{thing}{AnsiColors.RESET}")
-        else:
-            # Pretty print JSON for objects
-            json_str = json.dumps(thing, indent=4, default=str)
-            print(f"{color_code}{json_str}{AnsiColors.RESET}")
-
-
-def blue(*things: Any) -> None:
-    """Log in blue color."""
-    _log_with_color(list(things), "blue")
-
-
-def cyan(*things: Any) -> None:
-    """Log in cyan color."""
-    _log_with_color(list(things), "cyan")
-
-
-def yellow(*things: Any) -> None:
-    """Log in yellow color."""
-    _log_with_color(list(things), "yellow")
-
-
-def magenta(*things: Any) -> None:
-    """Log in magenta color."""
-    _log_with_color(list(things), "magenta")
+# Each color logs at a fixed level so LOG_LEVEL can silence the noisy ones.
+# Yellow is a WARNING, so it is kept for real problems, not routine progress
+COLOR_LEVELS = {
+    "red": logging.ERROR,
+    "yellow": logging.WARNING,
+    "gray": logging.DEBUG,
+    "darkgray": logging.DEBUG,
+}
 
+# Colors for records from plain loggers (Bolt, bots) that don't carry their own
+LEVEL_COLORS = {
+    logging.CRITICAL: AnsiColors.RED,
+    logging.ERROR: AnsiColors.RED,
+    logging.WARNING: AnsiColors.YELLOW,
+    logging.DEBUG: AnsiColors.GRAY,
+}
 
-def green(*things: Any) -> None:
-    """Log in green color."""
-    _log_with_color(list(things), "green")
 
-
-def red(*things: Any) -> None:
-    """Log in red color."""
-    _log_with_color(list(things), "red")
-
-
-def white(*things: Any) -> None:
-    """Log in white color."""
-    _log_with_color(list(things), "white")
-
-
-def gray(*things: Any) -> None:
-    """Log in gray color."""
-    _log_with_color(list(things), "gray")
-
-
-def grey(*things: Any) -> None:
-    """Log in grey color (alias for gray)."""
-    _log_with_color(list(things), "gray")
+class ColorFormatter(logging.Formatter):
+    """Formatter that wraps each record in its ANSI color."""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        color_code = getattr(record, "color_code", None) or LEVEL_COLORS.get(record.levelno)
+        if not color_code:
+            return message
+        return f"{color_code}{message}{AnsiColors.RESET}"
+
+
+def _log_with_color(things: Tuple[Any, ...], level: int, extra: Dict[str, str]) -> None:
+    """Log items at a level, with extra carrying the resolved color code."""
+    # All strings from one call go out as a single record (one handler lock + write)
+    lines = [thing for thing in things if isinstance(thing, str)]
+    if lines and logger.isEnabledFor(level):
+        logger.log(level, "%s", "\n".join(lines), extra=extra)
+    
+    if len(lines) < len(things) and logger.isEnabledFor(logging.DEBUG):
+        # Pretty print JSON for objects; event payloads are only worth it when debugging
+        dumps = [
+            orjson.dumps(thing, option=DUMP_OPTIONS, default=str).decode()
+            for thing in things if not isinstance(thing, str)
+        ]
+        logger.debug("%s", "\n".join(dumps), extra=extra)
+
+
+def _color_logger(color: str) -> Callable[..., None]:
+    """Build a log function for one color, resolving its code and level up front."""
+    level = COLOR_LEVELS.get(color, logging.INFO)
+    extra = {"color_code": getattr(AnsiColors, color.upper())}
+    
+    def log(*things: Any) -> None:
+        _log_with_color(things, level, extra)
+    
+    log.__name__ = color
+    log.__doc__ = f"Log in {color} color."
+    return log
 
 
-def darkgray(*things: Any) -> None:
-    """Log in dark gray color."""
-    _log_with_color(list(things), "darkgray")
+blue = _color_logger("blue")
+cyan = _color_logger("cyan")
+yellow = _color_logger("yellow")
+magenta = _color_logger("magenta")
+green = _color_logger("green")
+red = _color_logger("red")
+white = _color_logger("white")
+gray = _color_logger("gray")
+grey = gray  # Alias for gray
+darkgray = _color_logger("darkgray")
 
 
 # Divider constant
@@ -88,5 +100,5 @@ DIVIDER = "#########################################################\n##########
 
 
 def divider() -> None:
-    """Print a divider line."""
-    print(DIVIDER)
\ No newline at end of file
+    """Log a divider line."""
+    logger.info("%s", DIVIDER)
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""Small JSON-on-disk key/value cache with per-entry expiry."""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any, Optional
+from src.utils import colored_logs as llog
+
+
+class JsonFileCache:
+    """Cache JSON-serializable values as files in a directory, expiring them after a TTL."""
+
+    def __init__(self, directory: str, ttl_seconds: float):
+        """
+        Initialize cache directory.
+
+        Args:
+            directory: Directory to store entries in (created if missing)
+            ttl_seconds: Seconds an entry stays valid after it is written
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Map any key to a filesystem-safe entry path."""
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                os.unlink(path)
+                return None
+
+            with open(path, 'r') as entry:
+                return json.load(entry)
+
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            llog.yellow(f"⚠️ Failed to read cache entry: {str(e)}")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value, replacing any existing entry atomically.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+        """
+        temp_fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(temp_fd, 'w') as entry:
+                json.dump(value, entry)
+            os.replace(temp_path, self._path(key))
+
+        except Exception as e:
+            llog.yellow(f"⚠️ Failed to write cache entry: {str(e)}")
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+    
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if it exists.
+        
+        Args:
+            key: Cache key
+        """
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
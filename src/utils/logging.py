@@ -2,18 +2,24 @@
 
 import logging
 import os
+from src.utils.colored_logs import ColorFormatter
 
 
 def setup_logging():
     """Configure structured logging for the application."""
     log_level = os.environ.get('LOG_LEVEL', 'INFO').upper()
     
+    # The format doesn't use thread/process fields, so skip collecting them per record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    handler = logging.StreamHandler()
+    handler.setFormatter(ColorFormatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    
     logging.basicConfig(
         level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-        ]
+        handlers=[handler]
     )
     
     return logging.getLogger('research_bot')
\ No newline at end of file
@@ -1,150 +1,596 @@
 """OpenAI client utility for PDF summarization and analysis."""
 
+import asyncio
+import functools
+import hashlib
 import os
+import threading
+import time
+import orjson
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import (
+    APIConnectionError, AsyncOpenAI, BadRequestError, DefaultAioHttpClient, DefaultAsyncHttpxClient,
+    DefaultHttpxClient, InternalServerError, NotFoundError, OpenAI, RateLimitError
+)
+from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
 from src.utils import colored_logs as llog
-from src.utils.pdf_metadata_models import PDFMetadata
+from src.utils.file_cache import JsonFileCache
+from src.utils.pdf_helpers import get_pdf_page_count, hash_file
+from src.utils.pdf_metadata_models import PDFMetadata, PDFMetadataList
 
 # Ensure environment variables are loaded
 load_dotenv()
 
+# Structured extraction of a long PDF can take a few minutes
+OPENAI_TIMEOUT_SECONDS = 180.0
+
+# Extraction results are cached by PDF content hash, so a re-shared or
+# re-downloaded paper costs no OpenAI calls at all
+METADATA_CACHE_DIR = os.environ.get("PDF_METADATA_CACHE_DIR", "/tmp/pdf_metadata_cache")
+METADATA_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# Uploaded PDFs are reused by content hash; OpenAI deletes them after a week,
+# so cached file IDs expire a day before that
+UPLOAD_CACHE_DIR = os.environ.get("OPENAI_UPLOAD_CACHE_DIR", "/tmp/openai_upload_cache")
+UPLOAD_EXPIRES_AFTER_SECONDS = 7 * 24 * 60 * 60
+UPLOAD_CACHE_TTL_SECONDS = 6 * 24 * 60 * 60
+
+# Models with structured output support, cheapest first. A request starts on the
+# cheapest model suited to its PDFs and only moves up when a model is unavailable,
+# runs out of context or time, or its output doesn't fit the schema
+METADATA_MODELS = ["gpt-4o-mini", "gpt-4o", "gpt-5"]
+
+# PDFs at or under both limits start on the smallest model
+SMALL_PDF_MAX_PAGES = 20
+SMALL_PDF_MAX_BYTES = 5 * 1024 * 1024
+
+# PDFs are sent as text plus page images, so long ones overflow gpt-4o's 128k
+# context; PDFs over either limit go straight to the largest model
+LARGE_PDF_MIN_PAGES = 50
+LARGE_PDF_MIN_BYTES = 20 * 1024 * 1024
+
+# Batch API jobs are billed at half price and finish within this window
+BATCH_COMPLETION_WINDOW = "24h"
+BATCH_TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+# Strict JSON schemas for structured outputs, built once at import. responses.parse
+# would rebuild them from the Pydantic class on every call (and every model fallback),
+# so requests send these and validate output_text against the class themselves
+def json_schema_text_format(model: type[BaseModel]) -> Dict[str, Any]:
+    """Build the Responses API text format for a Pydantic model's JSON schema."""
+    try:
+        # Private SDK helper (what responses.parse uses); makes the schema strict
+        from openai.lib._parsing._responses import type_to_text_format_param
+        return type_to_text_format_param(model)
+    except ImportError:
+        # Plain Pydantic schemas don't meet strict mode's rules, so the output is
+        # only validated against the class afterwards
+        llog.yellow(f"⚠️ OpenAI SDK has no strict schema helper; sending {model.__name__} schema non-strict")
+        return {
+            "type": "json_schema",
+            "name": model.__name__,
+            "schema": model.model_json_schema(),
+            "strict": False,
+        }
+
+
+PDF_METADATA_TEXT_FORMAT = json_schema_text_format(PDFMetadata)
+PDF_METADATA_LIST_TEXT_FORMAT = json_schema_text_format(PDFMetadataList)
+
+# Shared by every extraction request, ahead of any per-file content
+EXTRACTION_INSTRUCTIONS = """
+Please analyze the attached PDF document and extract the following structured metadata:
+
+1. **Title**: Extract the exact title of the document
+2. **Year**: Publication year (check document text first, then use filename context if ArXiv format)
+3. **Topic**: Categorize into one of the provided topic options based on the main research focus
+4. **Study Type**: Identify the research methodology type
+5. **Link**: Any URL, DOI, or web reference mentioned in the document (including ArXiv links)
+6. **Summary**: Provide a comprehensive 3-4 paragraph summary covering:
+   - Main research question and objectives
+   - Key methodology and approach
+   - Primary findings and results
+   - Significance and implications
+
+Focus on accuracy and be conservative with categorization. If uncertain about topic or study type, choose the closest match.
+Use filename context to supplement missing information, especially for ArXiv papers.
+
+Note: If the filename appears to be an ArXiv paper (format like YYMM.NNNNN[vN].pdf), it provides dating context:
+- YYMM format: 2508 = 2025 August, 2412 = 2024 December, etc.
+- This can help determine publication year if not explicitly stated in the document
+"""
+
+MULTI_EXTRACTION_INSTRUCTIONS = EXTRACTION_INSTRUCTIONS + """
+Several PDFs are attached, each preceded by its filename context. Return one item
+per PDF, in the same order the PDFs are attached.
+"""
+
+
+@functools.lru_cache(maxsize=32)
+def prompt_cache_key(prefix: str, instructions: str) -> str:
+    """
+    Build a stable prompt_cache_key for requests that start with the given instructions.
+    
+    Requests sharing a key are routed to the same OpenAI prompt cache, so the
+    key only changes when the instructions themselves do. Keys are memoized,
+    since callers pass the same few static prompts over and over.
+    
+    Args:
+        prefix: Name for the kind of request, e.g. "pdf-metadata"
+        instructions: Static instructions sent first in every such request
+        
+    Returns:
+        str: The prefix followed by a short hash of the instructions
+    """
+    return f"{prefix}-" + hashlib.sha256(instructions.encode()).hexdigest()[:16]
+
+
+EXTRACTION_CACHE_KEY = prompt_cache_key("pdf-metadata", EXTRACTION_INSTRUCTIONS)
+MULTI_EXTRACTION_CACHE_KEY = prompt_cache_key("pdf-metadata", MULTI_EXTRACTION_INSTRUCTIONS)
+
+
+def describe_filename(filename: Optional[str] = None) -> str:
+    """Filename context sent alongside a PDF (ArXiv names carry the publication date)."""
+    return f'**FILENAME CONTEXT**: The file is named "{filename}"' if filename else "No filename available."
+
+
+def build_extraction_request(file_id: str, filename: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Build the Responses API arguments (everything but the model) for extracting a PDF's metadata.
+    
+    Args:
+        file_id (str): ID of the PDF uploaded to OpenAI's Files API
+        filename (str): Original filename for context
+        
+    Returns:
+        dict: Keyword arguments for responses.create
+    """
+    # Invariant instructions go first so every call shares the same prompt
+    # prefix (OpenAI prompt caching); per-file context follows the PDF
+    filename_context = describe_filename(filename)
+    
+    return {
+        "input": [
+            {
+                "role": "developer",
+                "content": EXTRACTION_INSTRUCTIONS
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "input_file",
+                        "file_id": file_id
+                    },
+                    {
+                        "type": "input_text",
+                        "text": filename_context
+                    }
+                ]
+            }
+        ],
+        "text": {"format": PDF_METADATA_TEXT_FORMAT},
+        "prompt_cache_key": EXTRACTION_CACHE_KEY
+    }
+
+
+
+def build_multi_extraction_request(files: List[Tuple[str, Optional[str]]]) -> Dict[str, Any]:
+    """
+    Build the Responses API arguments for extracting metadata from several PDFs in one request.
+    
+    Args:
+        files: (file_id, filename) pairs, in the order results should come back
+        
+    Returns:
+        dict: Keyword arguments for responses.create
+    """
+    content = []
+    for file_id, filename in files:
+        content.append({"type": "input_text", "text": describe_filename(filename)})
+        content.append({"type": "input_file", "file_id": file_id})
+    
+    return {
+        "input": [
+            {
+                "role": "developer",
+                "content": MULTI_EXTRACTION_INSTRUCTIONS
+            },
+            {
+                "role": "user",
+                "content": content
+            }
+        ],
+        "text": {"format": PDF_METADATA_LIST_TEXT_FORMAT},
+        "prompt_cache_key": MULTI_EXTRACTION_CACHE_KEY
+    }
+
+
+def choose_metadata_models(pdf_file_paths: List[str]) -> List[str]:
+    """
+    Pick the models to try for extracting metadata from some PDFs, in order.
+    
+    Short, small papers start on the cheapest model; longer ones (or a PDF
+    whose pages can't be counted) start one model up, and the longest and
+    largest go straight to the last model. The largest PDF in the request
+    decides.
+    
+    Args:
+        pdf_file_paths: Paths to the PDFs sent in one request
+        
+    Returns:
+        list: Models to try, cheapest first
+    """
+    start = 0
+    for pdf_file_path in pdf_file_paths:
+        page_count = get_pdf_page_count(pdf_file_path)
+        file_size = os.path.getsize(pdf_file_path)
+        if (page_count is not None and page_count > LARGE_PDF_MIN_PAGES) or file_size > LARGE_PDF_MIN_BYTES:
+            return METADATA_MODELS[-1:]
+        if page_count is None or page_count > SMALL_PDF_MAX_PAGES or file_size > SMALL_PDF_MAX_BYTES:
+            start = 1
+    return METADATA_MODELS[start:]
+
+
+def should_try_next_model(error: Exception) -> bool:
+    """
+    Decide whether a failed metadata request is worth repeating on the next model.
+    
+    A bigger model can help when the model is unavailable, the PDF overflowed
+    its context window, the output didn't fit the schema, or the request timed
+    out, lost its connection, hit a server error or hit the model's rate limit.
+    Earlier models aren't retried by the SDK, so these transient failures move
+    on instead. Other errors (auth, exhausted quota, bad files) would fail the
+    same way.
+    
+    Args:
+        error: Exception raised by the request or by validating its output
+        
+    Returns:
+        bool: True if the next model should be tried
+    """
+    if isinstance(error, (NotFoundError, APIConnectionError, InternalServerError, ValidationError)):
+        return True
+    if isinstance(error, RateLimitError):
+        return error.code != "insufficient_quota"
+    return isinstance(error, BadRequestError) and error.code == "context_length_exceeded"
+
 
 class OpenAIClient:
     """OpenAI client wrapper for document analysis."""
     
-    def __init__(self):
-        """Initialize OpenAI client with API key from environment."""
+    def __init__(self, http2: bool = True):
+        """
+        Initialize OpenAI client with API key from environment.
+        
+        Args:
+            http2 (bool): Multiplex concurrent requests over shared HTTP/2 connections
+        """
         api_key = os.environ.get("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         
         llog.gray(f"🔑 Initializing OpenAI client with API key: {api_key[:10]}...")
-        self.client = OpenAI(api_key=api_key)
+        
+        # One client for every request so its keep-alive connection pool is reused;
+        # DefaultHttpxClient keeps the SDK's pool limits (1000 connections, 100 kept alive).
+        # With HTTP/2, concurrent extractions share a connection instead of opening more
+        self.http_client = DefaultHttpxClient(http2=http2)
+        self.client = OpenAI(api_key=api_key, http_client=self.http_client, timeout=OPENAI_TIMEOUT_SECONDS)
+        # For every model but the last: a timed-out attempt escalates straight away
+        # instead of waiting out the SDK's retries (each up to the full timeout)
+        self.fallback_client = self.client.with_options(max_retries=0)
+        self.upload_cache = JsonFileCache(UPLOAD_CACHE_DIR, UPLOAD_CACHE_TTL_SECONDS)
+        self.metadata_cache = JsonFileCache(METADATA_CACHE_DIR, METADATA_CACHE_TTL_SECONDS)
     
-    def extract_pdf_metadata(self, pdf_file_path: str, filename: str = None) -> dict:
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self.client.close()
+    
+    def extract_pdf_metadata(self, pdf_file_path: str, filename: str = None, on_partial: Optional[Callable[[dict], None]] = None) -> dict:
         """
         Extract structured metadata from PDF using OpenAI with structured outputs.
         
+        The PDF is uploaded by handing the open file to files.create, which
+        streams it; the file is never read or base64-encoded into memory.
+        
         Args:
             pdf_file_path (str): Path to PDF file
             filename (str): Original filename for context
+            on_partial (callable): Called with the fields parsed so far as the
+                response streams in (optional; the response is not streamed without one)
             
         Returns:
             dict: Structured metadata extraction result
         """
+        content_hash = None
+        file_id = None
         try:
-            llog.yellow("🤖 Extracting PDF metadata using structured outputs...")
-            
-            # Upload PDF file to OpenAI
-            with open(pdf_file_path, 'rb') as pdf_file:
-                file_upload = self.client.files.create(
-                    file=pdf_file,
-                    purpose='user_data'
-                )
+            # An identical PDF we've already analyzed needs no OpenAI calls
+            content_hash = hash_file(pdf_file_path)
+            cached_result = self.metadata_cache.get(content_hash)
+            if cached_result:
+                llog.green(f"♻️ Using cached metadata for identical PDF: {filename or pdf_file_path}")
+                return cached_result
             
-            llog.cyan(f"📤 PDF uploaded to OpenAI: {file_upload.id}")
+            llog.cyan("🤖 Extracting PDF metadata using structured outputs...")
             
-            # Build context-aware metadata extraction prompt
-            filename_context = ""
-            if filename:
-                filename_context = f"""
-            
-            **FILENAME CONTEXT**: The file is named "{filename}"
-            
-            Note: If this appears to be an ArXiv paper (format like YYMM.NNNNN[vN].pdf), the filename provides dating context:
-            - YYMM format: 2508 = 2025 August, 2412 = 2024 December, etc.
-            - This can help determine publication year if not explicitly stated in the document
-            """
-            
-            extraction_prompt = f"""
-            Please analyze this PDF document and extract the following structured metadata:{filename_context}
-
-            1. **Title**: Extract the exact title of the document
-            2. **Year**: Publication year (check document text first, then use filename context if ArXiv format)
-            3. **Topic**: Categorize into one of the provided topic options based on the main research focus
-            4. **Study Type**: Identify the research methodology type
-            5. **Link**: Any URL, DOI, or web reference mentioned in the document (including ArXiv links)
-            6. **Summary**: Provide a comprehensive 3-4 paragraph summary covering:
-               - Main research question and objectives
-               - Key methodology and approach
-               - Primary findings and results
-               - Significance and implications
-
-            Focus on accuracy and be conservative with categorization. If uncertain about topic or study type, choose the closest match.
-            Use filename context to supplement missing information, especially for ArXiv papers.
-            """
-            
-            # Try models with structured output support
-            models_to_try = ["gpt-5", "gpt-4o", "gpt-4o-mini"]
+            # Retries of the same PDF after a failure reuse its earlier upload
+            file_id = self.upload_cache.get(content_hash)
+            reused_upload = bool(file_id)
+            if reused_upload:
+                llog.green(f"♻️ Reusing uploaded PDF: {file_id}")
+            else:
+                # Upload PDF file to OpenAI; the open file object is streamed in
+                # chunks rather than read into memory first
+                upload_name = filename or os.path.basename(pdf_file_path)
+                with open(pdf_file_path, 'rb') as pdf_file:
+                    file_upload = self.client.files.create(
+                        file=(upload_name, pdf_file, 'application/pdf'),
+                        purpose='user_data',
+                        expires_after={"anchor": "created_at", "seconds": UPLOAD_EXPIRES_AFTER_SECONDS}
+                    )
+                file_id = file_upload.id
+                self.upload_cache.set(content_hash, file_id)
+                
+                llog.cyan(f"📤 PDF uploaded to OpenAI: {file_id}")
             
-            for model in models_to_try:
+            models = choose_metadata_models([pdf_file_path])
+            for model in models:
                 try:
-                    llog.yellow(f"🎯 Trying structured extraction with: {model}")
-                    
-                    # Create client with timeout
-                    timeout_client = OpenAI(
-                        api_key=self.client.api_key,
-                        timeout=180.0
-                    )
+                    llog.cyan(f"🎯 Trying structured extraction with: {model}")
                     
                     # Use Responses API with structured output for PDF files
-                    response = timeout_client.responses.parse(
-                        model=model,
-                        input=[
-                            {
-                                "role": "user",
-                                "content": [
-                                    {
-                                        "type": "input_file",
-                                        "file_id": file_upload.id
-                                    },
-                                    {
-                                        "type": "input_text",
-                                        "text": extraction_prompt
-                                    }
-                                ]
-                            }
-                        ],
-                        text_format=PDFMetadata
-                    )
+                    client = self.client if model == models[-1] else self.fallback_client
+                    request = build_extraction_request(file_id, filename)
+                    if on_partial:
+                        output_text = self._stream_output_text(client, model, request, on_partial)
+                    else:
+                        output_text = client.responses.create(model=model, **request).output_text
                     
-                    # Get structured data directly from Responses API
-                    metadata = response.output_parsed
+                    # Output follows the strict schema; validate it into the model
+                    metadata = PDFMetadata.model_validate_json(output_text)
                     
                     llog.green(f"✅ Successfully extracted metadata with {model}")
                     
-                    # Cleanup uploaded file
-                    self.client.files.delete(file_upload.id)
-                    llog.gray(f"🗑️ Cleaned up uploaded file: {file_upload.id}")
-                    
-                    return {
+                    result = {
                         "success": True,
                         "metadata": metadata.model_dump(),
                         "model": model
                     }
+                    self.metadata_cache.set(content_hash, result)
+                    
+                    # Later requests for this PDF hit the metadata cache, so the upload
+                    # won't be read again
+                    self.upload_cache.delete(content_hash)
+                    self._delete_file_in_background(file_id)
+                    return result
                     
                 except Exception as e:
-                    llog.yellow(f"❌ {model} failed for structured extraction: {str(e)}")
-                    if model == models_to_try[-1]:  # Last model
+                    if not should_try_next_model(e) or model == models[-1]:
                         raise e
+                    llog.yellow(f"❌ {model} failed for structured extraction: {str(e)}")
                     continue
             
         except Exception as e:
             llog.red(f"OpenAI structured extraction error: {str(e)}")
+            if file_id and reused_upload:
+                # A reused upload may be the problem (or already gone); start fresh
+                # next time. A fresh upload stays cached for the user's retry
+                self.upload_cache.delete(content_hash)
+                self._delete_file_in_background(file_id)
             return {
                 "success": False,
                 "error": str(e),
                 "metadata": None
             }
     
-    def _encode_pdf_to_base64(self, pdf_file_path: str) -> str:
-        """Encode PDF file to base64 for direct upload."""
-        import base64
+    def _stream_output_text(self, client: OpenAI, model: str, request: Dict[str, Any], on_partial: Callable[[dict], None]) -> str:
+        """Stream a structured response, passing on_partial the JSON fields parsed so far after each delta."""
+        text = ""
+        with client.responses.stream(model=model, **request) as stream:
+            for event in stream:
+                if event.type != "response.output_text.delta":
+                    continue
+                
+                text += event.delta
+                # Progress is best effort; a failed callback mustn't lose the response
+                try:
+                    on_partial(from_json(text, allow_partial="trailing-strings"))
+                except Exception as e:
+                    llog.gray(f"⚠️ Skipped partial metadata update: {str(e)}")
+            
+            return stream.get_final_response().output_text
+    
+    def extract_pdf_metadata_multi(self, pdf_file_paths: List[str], batch_size: int = 5) -> List[dict]:
+        """
+        Extract metadata from several PDFs per request, sending the instructions once per batch.
+        
+        Args:
+            pdf_file_paths: Paths to PDF files (their basenames are used as filename context)
+            batch_size: PDFs attached to each request
+            
+        Returns:
+            list: Extraction results in the same order as pdf_file_paths, shaped like extract_pdf_metadata's
+        """
+        results = []
+        uploaded_file_ids = []
+        try:
+            files = []
+            for pdf_file_path in pdf_file_paths:
+                filename = os.path.basename(pdf_file_path)
+                with open(pdf_file_path, 'rb') as pdf_file:
+                    file_upload = self.client.files.create(
+                        file=(filename, pdf_file, 'application/pdf'),
+                        purpose='user_data'
+                    )
+                uploaded_file_ids.append(file_upload.id)
+                files.append((file_upload.id, filename))
+            
+            for start in range(0, len(files), batch_size):
+                batch = files[start:start + batch_size]
+                models = choose_metadata_models(pdf_file_paths[start:start + batch_size])
+                results.extend(self._extract_metadata_for_batch(batch, models))
+            
+            return results
+            
+        except Exception as e:
+            llog.red(f"OpenAI multi-PDF extraction error: {str(e)}")
+            failure = {"success": False, "error": str(e), "metadata": None}
+            return results + [failure] * (len(pdf_file_paths) - len(results))
+        
+        finally:
+            for file_id in uploaded_file_ids:
+                self._delete_file_in_background(file_id)
+    
+    def _extract_metadata_for_batch(self, files: List[Tuple[str, Optional[str]]], models: List[str]) -> List[dict]:
+        """Run one multi-PDF request, falling back through models, and split it into per-PDF results."""
+        for model in models:
+            try:
+                client = self.client if model == models[-1] else self.fallback_client
+                response = client.responses.create(
+                    model=model,
+                    **build_multi_extraction_request(files)
+                )
+                items = PDFMetadataList.model_validate_json(response.output_text).items
+                if len(items) != len(files):
+                    raise ValueError(f"Expected metadata for {len(files)} PDFs, got {len(items)}")
+                
+                llog.green(f"✅ Extracted metadata for {len(files)} PDFs with {model}")
+                return [{"success": True, "metadata": item.model_dump(), "model": model} for item in items]
+                
+            except Exception as e:
+                # ValueError also covers a wrong item count
+                if not (isinstance(e, ValueError) or should_try_next_model(e)) or model == models[-1]:
+                    raise e
+                llog.yellow(f"❌ {model} failed for multi-PDF extraction: {str(e)}")
+    
+    def extract_pdf_metadata_batch(self, pdf_file_paths: List[str], model: str = "gpt-4o", poll_seconds: float = 60.0) -> Dict[str, dict]:
+        """
+        Extract metadata from many PDFs with one Batch API job.
         
-        with open(pdf_file_path, 'rb') as pdf_file:
-            return base64.b64encode(pdf_file.read()).decode('utf-8')
+        Meant for bulk backfills: the job costs half as much as live requests
+        and has its own rate limits, but can take up to 24 hours, and this
+        method blocks until it finishes.
+        
+        Args:
+            pdf_file_paths: Paths to PDF files (their basenames are used as filename context)
+            model: Model to run every request with (there is no fallback in a batch)
+            poll_seconds: Seconds between batch status checks
+            
+        Returns:
+            dict: Extraction result for each path, shaped like extract_pdf_metadata's
+        """
+        uploaded_file_ids = []
+        try:
+            request_lines = []
+            for index, pdf_file_path in enumerate(pdf_file_paths):
+                filename = os.path.basename(pdf_file_path)
+                with open(pdf_file_path, 'rb') as pdf_file:
+                    file_upload = self.client.files.create(
+                        file=(filename, pdf_file, 'application/pdf'),
+                        purpose='user_data'
+                    )
+                uploaded_file_ids.append(file_upload.id)
+                
+                request = build_extraction_request(file_upload.id, filename)
+                request_lines.append(orjson.dumps({
+                    "custom_id": f"pdf-{index}",
+                    "method": "POST",
+                    "url": "/v1/responses",
+                    "body": {"model": model, **request}
+                }))
+            
+            batch_file = self.client.files.create(
+                file=("pdf_metadata_batch.jsonl", b"\n".join(request_lines), "application/jsonl"),
+                purpose='batch'
+            )
+            uploaded_file_ids.append(batch_file.id)
+            
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/responses",
+                completion_window=BATCH_COMPLETION_WINDOW
+            )
+            llog.cyan(f"📦 Submitted metadata batch {batch.id} for {len(pdf_file_paths)} PDFs")
+            
+            batch = self.wait_for_batch(batch.id, poll_seconds)
+            return self._parse_batch_results(batch, pdf_file_paths, model)
+            
+        finally:
+            for file_id in uploaded_file_ids:
+                self._delete_file_in_background(file_id)
+    
+    def wait_for_batch(self, batch_id: str, poll_seconds: float = 60.0):
+        """
+        Poll a Batch API job until it completes, fails, expires or is cancelled.
         
+        Args:
+            batch_id: Batch ID
+            poll_seconds: Seconds between status checks
+            
+        Returns:
+            Batch: The finished batch
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in BATCH_TERMINAL_STATUSES:
+                llog.cyan(f"📦 Batch {batch_id} finished: {batch.status}")
+                return batch
+            
+            llog.gray(f"⏳ Batch {batch_id} is {batch.status}")
+            time.sleep(poll_seconds)
+    
+    def _parse_batch_results(self, batch, pdf_file_paths: List[str], model: str) -> Dict[str, dict]:
+        """Map each request in a finished batch's output and error files back to its PDF path."""
+        paths_by_id = {f"pdf-{index}": path for index, path in enumerate(pdf_file_paths)}
+        results = {
+            path: {"success": False, "error": f"Batch {batch.status} without a result", "metadata": None}
+            for path in pdf_file_paths
+        }
+        
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line:
+                    continue
+                
+                entry = orjson.loads(line)
+                path = paths_by_id[entry["custom_id"]]
+                response = entry.get("response") or {}
+                body = response.get("body") or {}
+                if entry.get("error") or response.get("status_code") != 200:
+                    error = entry.get("error") or body.get("error") or "Request failed"
+                    results[path] = {"success": False, "error": str(error), "metadata": None}
+                    continue
+                
+                output_text = "".join(
+                    content["text"]
+                    for item in body.get("output", []) if item.get("type") == "message"
+                    for content in item.get("content", []) if content.get("type") == "output_text"
+                )
+                try:
+                    metadata = PDFMetadata.model_validate_json(output_text)
+                    results[path] = {"success": True, "metadata": metadata.model_dump(), "model": model}
+                except Exception as e:
+                    results[path] = {"success": False, "error": str(e), "metadata": None}
+        
+        return results
+    
+    def _delete_file_in_background(self, file_id: str) -> None:
+        """Delete an uploaded file on a daemon thread; nothing waits on the result."""
+        def delete():
+            try:
+                self.client.files.delete(file_id)
+                llog.gray(f"🗑️ Cleaned up uploaded file: {file_id}")
+            except Exception as e:
+                llog.yellow(f"⚠️ Failed to clean up uploaded file {file_id}: {str(e)}")
+        
+        threading.Thread(target=delete, daemon=True).start()
     
     def _estimate_cost(self, total_tokens):
         """Estimate cost based on gpt-4o-mini pricing."""
@@ -152,4 +598,109 @@ class OpenAIClient:
         # For simplicity, using average of $0.375 per 1M tokens
         cost_per_million = 0.375
         estimated_cost = (total_tokens / 1_000_000) * cost_per_million
-        return round(estimated_cost, 4)
\ No newline at end of file
+        return round(estimated_cost, 4)
+
+
+class AsyncOpenAIClient:
+    """Async OpenAI client wrapper for extracting metadata from many PDFs at once."""
+    
+    def __init__(self, aiohttp: bool = True):
+        """
+        Initialize async OpenAI client with API key from environment.
+        
+        Args:
+            aiohttp (bool): Use the aiohttp transport, which holds up better than
+                httpx's own under hundreds of concurrent requests
+        """
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY environment variable is not set")
+        
+        self.http_client = DefaultAioHttpClient() if aiohttp else DefaultAsyncHttpxClient()
+        self.client = AsyncOpenAI(api_key=api_key, http_client=self.http_client, timeout=OPENAI_TIMEOUT_SECONDS)
+        # No SDK retries before falling back to the next model (see OpenAIClient)
+        self.fallback_client = self.client.with_options(max_retries=0)
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.client.close()
+    
+    async def extract_pdf_metadata(self, pdf_file_path: str, filename: str = None) -> dict:
+        """
+        Extract structured metadata from PDF using OpenAI with structured outputs.
+        
+        Args:
+            pdf_file_path (str): Path to PDF file
+            filename (str): Original filename for context
+            
+        Returns:
+            dict: Structured metadata extraction result
+        """
+        file_id = None
+        try:
+            upload_name = filename or os.path.basename(pdf_file_path)
+            with open(pdf_file_path, 'rb') as pdf_file:
+                file_upload = await self.client.files.create(
+                    file=(upload_name, pdf_file, 'application/pdf'),
+                    purpose='user_data'
+                )
+            file_id = file_upload.id
+            
+            llog.cyan(f"📤 PDF uploaded to OpenAI: {file_id}")
+            
+            models = await asyncio.to_thread(choose_metadata_models, [pdf_file_path])
+            for model in models:
+                try:
+                    client = self.client if model == models[-1] else self.fallback_client
+                    response = await client.responses.create(
+                        model=model,
+                        **build_extraction_request(file_id, filename)
+                    )
+                    metadata = PDFMetadata.model_validate_json(response.output_text)
+                    
+                    llog.green(f"✅ Successfully extracted metadata for {upload_name} with {model}")
+                    return {
+                        "success": True,
+                        "metadata": metadata.model_dump(),
+                        "model": model
+                    }
+                    
+                except Exception as e:
+                    if not should_try_next_model(e) or model == models[-1]:
+                        raise e
+                    llog.yellow(f"❌ {model} failed for structured extraction: {str(e)}")
+            
+        except Exception as e:
+            llog.red(f"OpenAI structured extraction error: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e),
+                "metadata": None
+            }
+        
+        finally:
+            if file_id:
+                try:
+                    await self.client.files.delete(file_id)
+                except Exception as e:
+                    llog.yellow(f"⚠️ Failed to clean up uploaded file {file_id}: {str(e)}")
+    
+    async def extract_many(self, pdf_file_paths: List[str], max_concurrency: int = 16) -> List[dict]:
+        """
+        Extract metadata from many PDFs concurrently.
+        
+        Args:
+            pdf_file_paths: Paths to PDF files (their basenames are used as filename context)
+            max_concurrency: Maximum number of extractions in flight at once
+            
+        Returns:
+            list: Extraction results in the same order as pdf_file_paths
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def extract_one(pdf_file_path):
+            async with semaphore:
+                return await self.extract_pdf_metadata(pdf_file_path, os.path.basename(pdf_file_path))
+        
+        llog.magenta(f"🔄 Extracting metadata from {len(pdf_file_paths)} PDFs")
+        return await asyncio.gather(*(extract_one(path) for path in pdf_file_paths))
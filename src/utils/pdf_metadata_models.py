@@ -1,12 +1,40 @@
 """Pydantic models for structured PDF metadata extraction."""
 
-from typing import Optional, Literal
-from pydantic import BaseModel, Field
+from enum import StrEnum
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Topic(StrEnum):
+    """Research topic categories (the Airtable Topic options)."""
+    
+    LEARNING_OUTCOMES = "Learning outcomes"
+    TOOL_DEVELOPMENT = "Tool development"
+    PROFESSIONAL_PRACTICE = "Professional practice"
+    STUDENT_PERSPECTIVES = "Student perspectives"
+    USER_EXPERIENCE = "User experience and interaction"
+    THEORETICAL_BACKGROUND = "Theoretical background"
+    AI_LITERACY = "AI literacy"
+    OTHER = "Other"
+
+
+class StudyType(StrEnum):
+    """Research methodology types (the Airtable StudyType options)."""
+    
+    REVIEW = "Review"
+    EXPERIMENTAL = "Experimental"
+    QUANTITATIVE = "Quantitative"
+    QUALITATIVE = "Qualitative"
+    MIXED_METHODS = "Mixed-methods"
+    OBSERVATIONAL = "Observational"
 
 
 class PDFMetadata(BaseModel):
     """Structured model for PDF metadata extraction."""
     
+    # Enum fields validate with a hash lookup and store their plain string values
+    model_config = ConfigDict(use_enum_values=True, frozen=True)
+    
     title: str = Field(
         description="The title of the PDF document"
     )
@@ -18,27 +46,11 @@ class PDFMetadata(BaseModel):
         le=2030
     )
     
-    topic: Literal[
-        "Learning outcomes",
-        "Tool development", 
-        "Professional practice",
-        "Student perspectives",
-        "User experience and interaction",
-        "Theoretical background",
-        "AI literacy",
-        "Other"
-    ] = Field(
+    topic: Topic = Field(
         description="Primary research topic category"
     )
     
-    study_type: Literal[
-        "Review",
-        "Experimental", 
-        "Quantitative",
-        "Qualitative",
-        "Mixed-methods",
-        "Observational"
-    ] = Field(
+    study_type: StudyType = Field(
         description="Type of research study methodology"
     )
     
@@ -49,4 +61,12 @@ class PDFMetadata(BaseModel):
     
     summary: str = Field(
         description="A comprehensive summary of the document's key findings and contributions"
+    )
+
+
+class PDFMetadataList(BaseModel):
+    """Structured model for extracting metadata from several PDFs in one request."""
+    
+    items: List[PDFMetadata] = Field(
+        description="Metadata for each attached PDF, in the order the PDFs were attached"
     )
\ No newline at end of file
@@ -1,19 +1,90 @@
 """Slack utility functions and helpers."""
 
+import threading
+import time
+from cachetools import TTLCache
+from slack_sdk.errors import SlackApiError
+
+# Several events for one upload (file_shared, re-shares, reactions) arrive
+# together, so file details are reused briefly instead of refetched
+FILE_INFO_TTL_SECONDS = 300
+_file_info_cache = TTLCache(maxsize=1024, ttl=FILE_INFO_TTL_SECONDS)
+_file_info_lock = threading.Lock()
+
+# Channel names rarely change, so they're looked up once an hour at most.
+# Unknown channels are remembered briefly so repeated lookups don't hammer Slack
+CHANNEL_NAME_TTL_SECONDS = 3600
+CHANNEL_NOT_FOUND_TTL_SECONDS = 60
+_channel_name_cache = TTLCache(maxsize=1024, ttl=CHANNEL_NAME_TTL_SECONDS)
+_channel_not_found_cache = TTLCache(maxsize=1024, ttl=CHANNEL_NOT_FOUND_TTL_SECONDS)
+_channel_name_lock = threading.Lock()
+
+# chat.update is rate limited per workspace (Tier 3, ~50 calls/min), and every
+# message being streamed at once draws on that one budget. Progress updates from
+# all streamers together are held to one per interval, leaving headroom for final
+# results and errors, which always go out
+PROGRESS_UPDATE_INTERVAL = 2.0
+_progress_update_lock = threading.Lock()
+_last_progress_update = 0.0
+
+PDF_MIMETYPES = frozenset({'application/pdf', 'application/x-pdf'})
+
 
 def is_pdf_file(file_info):
     """Check if uploaded file is a PDF."""
-    return (
-        file_info.get('mimetype') == 'application/pdf' or
-        file_info.get('name', '').lower().endswith('.pdf')
-    )
+    if file_info.get('mimetype') in PDF_MIMETYPES:
+        return True
+    
+    # Only lowercase the extension, and only when it isn't already a common spelling
+    name = file_info.get('name') or ''
+    return name.endswith(('.pdf', '.PDF')) or name[-4:].lower() == '.pdf'
+
+
+def get_file_info(client, file_id, refresh=False):
+    """
+    Get a file's details from Slack, reusing a recent lookup when possible.
+    
+    Args:
+        client: Slack WebClient
+        file_id: Slack file ID
+        refresh: Skip the cache and fetch fresh details
+        
+    Returns:
+        tuple: (file object from files.info, True if it came from the cache)
+    """
+    if not refresh:
+        with _file_info_lock:
+            file_data = _file_info_cache.get(file_id)
+        if file_data is not None:
+            return file_data, True
+    
+    file_data = client.files_info(file=file_id).get("file", {})
+    with _file_info_lock:
+        _file_info_cache[file_id] = file_data
+    return file_data, False
 
 
 def get_channel_name(client, channel_id):
-    """Get channel name from channel ID."""
+    """Get channel name from channel ID, falling back to the ID if it can't be found."""
+    with _channel_name_lock:
+        name = _channel_name_cache.get(channel_id)
+        if name is None and channel_id in _channel_not_found_cache:
+            return channel_id
+    if name is not None:
+        return name
+    
     try:
         response = client.conversations_info(channel=channel_id)
-        return response['channel']['name']
+        name = response['channel']['name']
+        with _channel_name_lock:
+            _channel_name_cache[channel_id] = name
+        return name
+    except SlackApiError as e:
+        print(f"Error getting channel name: {e}")
+        if e.response.get('error') == 'channel_not_found':
+            with _channel_name_lock:
+                _channel_not_found_cache[channel_id] = True
+        return channel_id
     except Exception as e:
         print(f"Error getting channel name: {e}")
         return channel_id
@@ -29,4 +100,72 @@ def send_startup_message(client, channel_id, bot_name="Python Research Bot"):
         return True
     except Exception as e:
         print(f"Failed to send startup message: {e}")
-        return False
\ No newline at end of file
+        return False
+
+
+def take_progress_update_slot():
+    """Claim the process-wide slot for one progress update; False if another message used it too recently."""
+    global _last_progress_update
+    with _progress_update_lock:
+        now = time.monotonic()
+        if now - _last_progress_update < PROGRESS_UPDATE_INTERVAL:
+            return False
+        _last_progress_update = now
+        return True
+
+
+class SlackMessageStreamer:
+    """Post a placeholder message and progressively update it as text arrives."""
+    
+    def __init__(self, client, channel_id, thread_ts=None, placeholder="⏳ Working on it...", flush_interval=1.0):
+        """
+        Post the placeholder message.
+        
+        Args:
+            client: Slack WebClient
+            channel_id: Channel to post in
+            thread_ts: Thread to reply in (optional)
+            placeholder: Text shown until the first update
+            flush_interval: Minimum seconds between this message's progress updates
+                (progress across all messages is also capped process-wide)
+        """
+        self.client = client
+        self.channel_id = channel_id
+        self.flush_interval = flush_interval
+        self.text = ""
+        self.last_flush = 0.0
+        
+        response = client.chat_postMessage(channel=channel_id, text=placeholder, thread_ts=thread_ts)
+        self.ts = response["ts"]
+    
+    def append(self, delta):
+        """Add text and update the message if the flush interval has passed."""
+        self.text += delta
+        self._flush_progress()
+    
+    def update(self, text):
+        """Replace the accumulated text and update the message if the flush interval has passed."""
+        if text == self.text:
+            return  # Nothing visible changed; save the rate-limited update
+        self.text = text
+        self._flush_progress()
+    
+    def _flush_progress(self):
+        """Update the message if its flush interval has passed and the shared rate budget allows."""
+        if time.monotonic() - self.last_flush >= self.flush_interval and take_progress_update_slot():
+            self.flush()
+    
+    def reset(self):
+        """Discard accumulated text (e.g. before retrying a failed stream)."""
+        self.text = ""
+    
+    def flush(self):
+        """Update the message with the accumulated text."""
+        if self.text:
+            self.client.chat_update(channel=self.channel_id, ts=self.ts, text=self.text)
+        self.last_flush = time.monotonic()
+    
+    def finish(self, text):
+        """Replace the message with its final text."""
+        self.text = text
+        self.flush()
@@ -1,5 +1,15 @@
 """Generic text processing utilities."""
 
+import re
+from typing import Iterator, Optional
+import tiktoken
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# count_words splits this many characters at a time, so only one window's
+# words are ever held in memory
+WORD_COUNT_WINDOW = 1 << 16
+
 
 def chunk_text_at_line_breaks(text: str, max_length: int = 2800) -> list:
     """
@@ -22,37 +32,68 @@ def chunk_text_at_line_breaks(text: str, max_length: int = 2800) -> list:
         >>> chunks = chunk_text_at_line_breaks(text, max_length=50)
         >>> len(chunks[0]) <= 50  # True
     """
-    if len(text) <= max_length:
-        return [text]
+    return list(iter_chunks_at_line_breaks(text, max_length))
+
+
+def iter_chunks_at_line_breaks(text: str, max_length: int = 2800) -> Iterator[str]:
+    """
+    Lazily yield the chunks chunk_text_at_line_breaks would return.
     
-    chunks = []
-    remaining_text = text
+    Args:
+        text: Text to split
+        max_length: Maximum length per chunk
+        
+    Yields:
+        Text chunks, each under max_length characters
+    """
+    text_length = len(text)
+    if text_length <= max_length:
+        yield text
+        return
+    
+    # Walk indices over the original string instead of re-slicing the
+    # remainder each time, so each character is copied once
+    start = 0
     
-    while remaining_text:
-        if len(remaining_text) <= max_length:
-            chunks.append(remaining_text)
+    while start < text_length:
+        if text_length - start <= max_length:
+            yield text[start:]
             break
-            
+        
+        window_end = start + max_length
+        
         # Find the last line break before max_length
-        chunk = remaining_text[:max_length]
-        last_newline = chunk.rfind('\n')
+        split_at = text.rfind('\n', start, window_end)
+        if split_at <= start:
+            # No line break found, split at word boundary
+            split_at = text.rfind(' ', start, window_end)
         
-        if last_newline > 0:
-            # Split at the line break
-            chunks.append(remaining_text[:last_newline])
-            remaining_text = remaining_text[last_newline + 1:]
+        if split_at > start:
+            # Split at the break, dropping the break character itself
+            yield text[start:split_at]
+            start = split_at + 1
         else:
-            # No line break found, split at word boundary
-            last_space = chunk.rfind(' ')
-            if last_space > 0:
-                chunks.append(remaining_text[:last_space])
-                remaining_text = remaining_text[last_space + 1:]
-            else:
-                # Last resort: hard split
-                chunks.append(remaining_text[:max_length])
-                remaining_text = remaining_text[max_length:]
+            # Last resort: hard split
+            yield text[start:window_end]
+            start = window_end
+
+
+def prepare_for_slack(text: str, max_chunk: int = 2800, hard_cap: Optional[int] = None) -> Iterator[str]:
+    """
+    Truncate text and split it into Slack-sized chunks in a single pass.
     
-    return chunks
+    Args:
+        text: Text to post
+        max_chunk: Maximum length per chunk (Slack section blocks allow 3000)
+        hard_cap: Maximum total length, truncated with "..." when exceeded
+        
+    Yields:
+        Text chunks, each under max_chunk characters
+    """
+    if hard_cap is not None:
+        text = truncate_text(text, hard_cap)
+    
+    yield from iter_chunks_at_line_breaks(text, max_chunk)
 
 
 def truncate_text(text: str, max_length: int, suffix: str = "...") -> str:
@@ -77,13 +118,27 @@ def count_words(text: str) -> int:
     """
     Count words in text.
     
+    Words are whitespace-separated, as with str.split, but the text is split
+    in windows rather than all at once to avoid building a list of every word.
+    
     Args:
         text: Text to count words in
         
     Returns:
         Number of words
     """
-    return len(text.split())
+    count = 0
+    previous_ended_in_word = False
+    for start in range(0, len(text), WORD_COUNT_WINDOW):
+        window = text[start:start + WORD_COUNT_WINDOW]
+        count += len(window.split())
+        
+        # A word cut by the window boundary was counted in both windows
+        if previous_ended_in_word and not window[0].isspace():
+            count -= 1
+        previous_ended_in_word = not window[-1].isspace()
+    
+    return count
 
 
 def normalize_whitespace(text: str) -> str:
@@ -96,6 +151,54 @@ def normalize_whitespace(text: str) -> str:
     Returns:
         Text with normalized whitespace
     """
-    import re
     # Replace multiple whitespace with single space
-    return re.sub(r'\s+', ' ', text).strip()
\ No newline at end of file
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def count_tokens(text: str, encoding_name: str = "o200k_base") -> int:
+    """
+    Count model tokens in text.
+    
+    Args:
+        text: Text to count tokens in
+        encoding_name: tiktoken encoding (default matches GPT-4o/GPT-5)
+        
+    Returns:
+        Number of tokens
+    """
+    return len(tiktoken.get_encoding(encoding_name).encode(text))
+
+
+def split_text_by_tokens(text: str, max_tokens: int, encoding_name: str = "o200k_base") -> list:
+    """
+    Split text into consecutive chunks of at most max_tokens tokens.
+    
+    Chunks end at a line break when there is one in the second half of the
+    chunk, so paragraphs and pages aren't cut mid-sentence.
+    
+    Args:
+        text: Text to split
+        max_tokens: Maximum tokens per chunk
+        encoding_name: tiktoken encoding (default matches GPT-4o/GPT-5)
+        
+    Returns:
+        List of text chunks in original order
+    """
+    encoding = tiktoken.get_encoding(encoding_name)
+    tokens = encoding.encode(text)
+    
+    chunks = []
+    start = 0
+    while start < len(tokens):
+        stop = min(start + max_tokens, len(tokens))
+        if stop < len(tokens):
+            # Walk back to the last token containing a line break
+            for i in range(stop - 1, start + max_tokens // 2, -1):
+                if b"\n" in encoding.decode_single_token_bytes(tokens[i]):
+                    stop = i + 1
+                    break
+        
+        chunks.append(encoding.decode(tokens[start:stop]))
+        start = stop
+    
+    return chunks